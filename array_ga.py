@@ -0,0 +1,239 @@
+# array_ga.py
+# Array-backed GA for very large populations. DEAP individuals are Python lists with
+# one Fitness object each, and Statistics goes through a tuple per individual, so a
+# 10^6-individual population costs hundreds of bytes per individual and most of the
+# time is spent in the interpreter. Here the population is two contiguous float64
+# arrays (genes (P, G), fitness (P,)), double-buffered across generations, and
+# tournament selection, cxBlend, mutGaussian, evaluation and statistics are all
+# vectorized over fixed-size chunks, so temporaries do not grow with P either.
+#
+# The operators and their parameters are the ones of make_toolbox (tournament of 3,
+# cxBlend alpha 0.5, mutGaussian with indpb 0.2, only changed individuals are
+# re-evaluated), but the random streams come from numpy, so runs are not
+# bit-identical to the DEAP loop.
+#
+#   python array_ga.py --preset FAR_ORBIT --pop 1000000 --ngen 40
+#   python array_ga.py --pop 100000 --compare-deap       # memory / time vs DEAP lists
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from ga_engine import BiellipticProblem, R_EARTH
+from ga_profiler import NULL_PROFILER
+from scenario_sweep import PRESETS
+
+
+class ArrayPopulation:
+    """Genes (P, G) and fitness (P,) of a population in contiguous float64 arrays."""
+
+    def __init__(self, size, n_genes):
+        self.genes = np.empty((size, n_genes))
+        self.fitness = np.full(size, np.nan)
+
+    def __len__(self):
+        return len(self.fitness)
+
+    @property
+    def nbytes(self):
+        return self.genes.nbytes + self.fitness.nbytes
+
+    def best(self):
+        i = int(np.argmin(self.fitness))
+        return self.genes[i].copy(), float(self.fitness[i])
+
+
+def _chunks(n, chunk_size):
+    for start in range(0, n, chunk_size):
+        yield slice(start, min(start + chunk_size, n))
+
+
+def select_tournament(fitness, k, tournsize, rng):
+    """Indices of `k` tournament winners (lowest fitness, first one on ties, as selTournament)."""
+    aspirants = rng.integers(0, len(fitness), (k, tournsize))
+    return aspirants[np.arange(k), np.argmin(fitness[aspirants], axis=1)]
+
+
+def crossover(genes, cxpb, alpha, changed, rng):
+    """cxBlend on consecutive pairs, in place on a (n, G) chunk; marks the children in `changed`."""
+    n = len(genes) - len(genes) % 2
+    mate = rng.random(n // 2) < cxpb
+    first, second = genes[0:n:2], genes[1:n:2]
+    a, b = first[mate], second[mate]
+    gamma = (1.0 + 2.0 * alpha) * rng.random(a.shape) - alpha
+    first[mate] = (1.0 - gamma) * a + gamma * b
+    second[mate] = gamma * a + (1.0 - gamma) * b
+    changed[0:n:2] |= mate
+    changed[1:n:2] |= mate
+
+
+def mutate(genes, mutpb, sigma, indpb, changed, rng):
+    """mutGaussian (mu 0) in place on a (n, G) chunk; marks the mutants in `changed`."""
+    rows = np.flatnonzero(rng.random(len(genes)) < mutpb)
+    noise = rng.normal(0.0, 1.0, (len(rows), genes.shape[1])) * sigma
+    genes[rows] += np.where(rng.random(noise.shape) < indpb, noise, 0.0)
+    changed[rows] = True
+
+
+def run_array_ga(problem, pop_size=1000000, ngen=40, cxpb=0.7, mutpb=0.2, bounds=((1.01, 500.0),),
+                 sigma=10.0, alpha=0.5, indpb=0.2, tournsize=3, seed=None, chunk_size=1 << 16,
+                 stall_generations=None, rel_tol=1e-6, time_budget=None, verbose=False,
+                 profiler=None, writer=None):
+    """
+    Generational GA on an ArrayPopulation. `problem` needs evaluate_array(genes) ->
+    fitness (BiellipticProblem, NImpulseProblem, PlaneChangeProblem); `bounds` holds
+    the initial (low, high) range of every gene. Stopping rules, profiler phases and
+    `writer` rows are the same as in ga_engine.ea_early_stopping.
+    Returns (population, info) with the best genes / fitness in info.
+    """
+    rng = np.random.default_rng(seed)
+    profiler = profiler or NULL_PROFILER
+    low, high = np.asarray(bounds, dtype=float).T
+    sigma = np.broadcast_to(np.asarray(sigma, dtype=float), low.shape)
+    chunk_size += chunk_size % 2  # crossover pairs never straddle two chunks
+    parents = ArrayPopulation(pop_size, len(low))
+    children = ArrayPopulation(pop_size, len(low))
+    start = time.perf_counter()
+
+    def record(gen, nevals, population):
+        with profiler.phase("stats"):
+            total, minimum = 0.0, np.inf
+            for s in _chunks(len(population), chunk_size):
+                total += float(population.fitness[s].sum())
+                minimum = min(minimum, float(population.fitness[s].min()))
+            stats = {"avg": total / len(population), "min": minimum}
+        timings = profiler.end_generation(gen, nevals, stats)
+        if verbose:
+            print(f"{gen}\t{nevals}\t{stats['avg']:.6g}\t{stats['min']:.6g}")
+        if writer is not None:
+            row = dict(timings) if timings else {"gen": gen, "nevals": nevals}
+            row.update(stats, elapsed_s=time.perf_counter() - start)
+            writer.append("generations", row)
+        return minimum
+
+    if verbose:
+        print("gen\tnevals\tavg\tmin")
+    with profiler.phase("evaluate"):
+        for s in _chunks(pop_size, chunk_size):
+            parents.genes[s] = rng.uniform(low, high, (s.stop - s.start, len(low)))
+            parents.fitness[s] = problem.evaluate_array(parents.genes[s])
+    best = record(0, pop_size, parents)
+    best_genes, _ = parents.best()
+    evaluations = pop_size
+    improvements = [(0, best)]
+    stall = 0
+    stop_reason = "ngen"
+    gen = 0
+
+    for gen in range(1, ngen + 1):
+        nevals = 0
+        for s in _chunks(pop_size, chunk_size):
+            with profiler.phase("select"):
+                winners = select_tournament(parents.fitness, s.stop - s.start, tournsize, rng)
+            with profiler.phase("clone"):
+                genes = children.genes[s]
+                np.take(parents.genes, winners, axis=0, out=genes)
+                np.take(parents.fitness, winners, out=children.fitness[s])
+            changed = np.zeros(len(genes), dtype=bool)
+            with profiler.phase("mate"):
+                crossover(genes, cxpb, alpha, changed, rng)
+            with profiler.phase("mutate"):
+                mutate(genes, mutpb, sigma, indpb, changed, rng)
+            with profiler.phase("evaluate"):
+                rows = np.flatnonzero(changed)
+                children.fitness[s][rows] = problem.evaluate_array(genes[rows])
+                nevals += len(rows)
+        parents, children = children, parents
+        evaluations += nevals
+
+        minimum = record(gen, nevals, parents)
+        if best - minimum > rel_tol * abs(best):
+            stall = 0
+        else:
+            stall += 1
+        if minimum < best:
+            best_genes, _ = parents.best()
+            improvements.append((gen, minimum))
+            best = minimum
+        if stall_generations is not None and stall >= stall_generations:
+            stop_reason = "stall"
+            break
+        if time_budget is not None and time.perf_counter() - start >= time_budget:
+            stop_reason = "time_budget"
+            break
+
+    info = {
+        "best_genes": best_genes,
+        "best_fitness": best,
+        "stop_reason": stop_reason,
+        "generations_run": gen,
+        "evaluations": evaluations,
+        "convergence_generation": next(g for g, value in improvements
+                                       if value <= best + rel_tol * abs(best)),
+        "loop_time_s": time.perf_counter() - start,
+        "population_bytes": parents.nbytes + children.nbytes,
+    }
+    return parents, info
+
+
+def _measure(func, trace=False):
+    """(result, seconds, peak traced memory in bytes or None) of func()."""
+    if trace:
+        # tracemalloc slows the list-based DEAP loop down a lot: times are only
+        # comparable between runs with the same setting
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - t0
+    peak = None
+    if trace:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def _memory(peak):
+    return f", peak memory {peak / 2**20:.1f} MiB" if peak is not None else ""
+
+
+def main():
+    from ga_engine import run_ga
+
+    parser = argparse.ArgumentParser(description="Array-backed GA for very large populations.")
+    parser.add_argument('--preset', default='FAR_ORBIT', choices=sorted(PRESETS))
+    parser.add_argument('--pop', type=int, default=1000000)
+    parser.add_argument('--ngen', type=int, default=40)
+    parser.add_argument('--chunk', type=int, default=1 << 16, help="Individuals processed per chunk.")
+    parser.add_argument('--stall', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--compare-deap', action='store_true',
+                        help="Also run the DEAP list-of-lists GA on the same population size.")
+    parser.add_argument('--memory', action='store_true', help="Report peak memory (tracemalloc).")
+    args = parser.parse_args()
+
+    altitude, r_target = PRESETS[args.preset]
+    r_initial = R_EARTH + altitude
+    problem = BiellipticProblem(r_initial, r_target)
+    print(f"--- Array-backed GA: {args.preset}, population {args.pop}, {args.ngen} generations ---")
+    (_, info), elapsed, peak = _measure(lambda: run_array_ga(
+        problem, args.pop, args.ngen, seed=args.seed, chunk_size=args.chunk,
+        stall_generations=args.stall), args.memory)
+    summary = problem.summary(info["best_genes"][0])
+    print(f"array GA : best Delta-V {summary['dv_total']:.4f} m/s (rb_ratio {summary['rb_ratio']:.4f}), "
+          f"{info['evaluations']} evaluations in {elapsed:.2f} s "
+          f"({info['evaluations'] / elapsed:,.0f} evals/s){_memory(peak)} "
+          f"({info['population_bytes'] / 2**20:.1f} MiB of population arrays)")
+
+    if args.compare_deap:
+        result, elapsed, peak = _measure(lambda: run_ga(r_initial, r_target, args.pop, args.ngen,
+                                                        seed=args.seed, stall_generations=args.stall),
+                                         args.memory)
+        print(f"DEAP GA  : best Delta-V {result['dv_total']:.4f} m/s (rb_ratio {result['rb_ratio']:.4f}), "
+              f"{result['evaluations']} evaluations in {elapsed:.2f} s "
+              f"({result['evaluations'] / elapsed:,.0f} evals/s){_memory(peak)}")
+
+
+if __name__ == "__main__":
+    main()
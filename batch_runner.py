@@ -0,0 +1,113 @@
+# batch_runner.py
+# Statistical batch runner for the paper experiments: N seeded repetitions of the GA
+# per scenario, spread over a process pool, aggregated into mean / confidence-interval
+# tables. Every run seeds its own RNGs, so any row can be reproduced from its seed:
+#   python -c "from ga_engine import run_ga; print(run_ga(r_initial, r_target, seed=SEED))"
+#
+# Example:
+#   python batch_runner.py --preset GEO FAR_ORBIT --runs 30 --workers 16
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy import stats as st
+
+from ga_engine import R_EARTH, run_ga
+from results_store import ColumnStore
+from scenario_sweep import PRESETS, write_table
+
+METRICS = ["dv_total", "savings_vs_hohmann", "convergence_generation", "generations", "evaluations",
+           "wall_time_s"]
+
+
+def _run_seed(args):
+    name, seed, ga_kwargs, log_dir = args
+    altitude, r_target = PRESETS[name]
+    if log_dir is None:
+        return dict(scenario=name, **run_ga(R_EARTH + altitude, r_target, seed=seed, **ga_kwargs))
+    with ColumnStore(log_dir, part=os.getpid()) as store:
+        return dict(scenario=name, **run_ga(R_EARTH + altitude, r_target, seed=seed, writer=store,
+                                            tags={"scenario": name, "seed": seed}, **ga_kwargs))
+
+
+def run_batch(scenarios, n_runs=30, base_seed=0, workers=None, log_dir=None, **ga_kwargs):
+    """
+    Run seeds base_seed .. base_seed + n_runs - 1 for every scenario, in parallel.
+    With `log_dir`, every run streams its generations and summary to a results store.
+    """
+    tasks = [(name, base_seed + i, ga_kwargs, log_dir) for name in scenarios for i in range(n_runs)]
+    workers = workers or os.cpu_count()
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_run_seed, tasks, chunksize=chunksize))
+
+
+def confidence_interval(values, confidence=0.95):
+    """Mean and half-width of the Student-t confidence interval."""
+    values = np.asarray(values, dtype=float)
+    mean = values.mean()
+    if len(values) < 2:
+        return mean, 0.0
+    sem = values.std(ddof=1) / np.sqrt(len(values))
+    return mean, sem * st.t.ppf((1 + confidence) / 2, len(values) - 1)
+
+
+def aggregate(results, confidence=0.95):
+    """One summary row per scenario: mean, CI half-width, min and max of each metric."""
+    summary = []
+    for name in dict.fromkeys(r["scenario"] for r in results):
+        runs = [r for r in results if r["scenario"] == name]
+        row = {"scenario": name, "runs": len(runs),
+               "ga_beats_hohmann": sum(r["savings_vs_hohmann"] > 0 for r in runs)}
+        for metric in METRICS:
+            values = [r[metric] for r in runs]
+            mean, half_width = confidence_interval(values, confidence)
+            row[f"{metric}_mean"] = mean
+            row[f"{metric}_ci"] = half_width
+            row[f"{metric}_min"] = min(values)
+            row[f"{metric}_max"] = max(values)
+        summary.append(row)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-seed GA repetitions with mean / CI tables.")
+    parser.add_argument('--preset', nargs='+', default=['GEO', 'FAR_ORBIT'], choices=sorted(PRESETS))
+    parser.add_argument('--runs', type=int, default=30)
+    parser.add_argument('--base-seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--pop', type=int, default=50)
+    parser.add_argument('--ngen', type=int, default=40)
+    parser.add_argument('--stall', type=int, default=None)
+    parser.add_argument('--confidence', type=float, default=0.95)
+    parser.add_argument('--output', default=os.path.join('results', 'batch_runs.csv'))
+    parser.add_argument('--log', default=None,
+                        help="Stream per-generation stats and run summaries to this results store.")
+    args = parser.parse_args()
+
+    print(f"--- Batch: {args.runs} seeded runs x {len(args.preset)} scenarios ---")
+    start = time.perf_counter()
+    results = run_batch(args.preset, args.runs, args.base_seed, args.workers, args.log,
+                        pop_size=args.pop, ngen=args.ngen, stall_generations=args.stall)
+    elapsed = time.perf_counter() - start
+    summary = aggregate(results, args.confidence)
+
+    write_table(results, args.output)
+    summary_file = os.path.splitext(args.output)[0] + '_summary.csv'
+    write_table(summary, summary_file)
+
+    pct = f"{args.confidence:.0%}"
+    for row in summary:
+        print(f"\n{row['scenario']} ({row['runs']} runs, GA better than Hohmann in {row['ga_beats_hohmann']})")
+        for metric in METRICS:
+            print(f"  {metric:24s} {row[metric + '_mean']:14.4f} ± {row[metric + '_ci']:.4f} ({pct} CI)")
+    print(f"\nFinished in {elapsed:.2f} s -> runs: {args.output}, summary: {summary_file}")
+    if args.log is not None:
+        print(f"-> Generation stats and run summaries streamed to: {args.log}")
+
+
+if __name__ == "__main__":
+    main()
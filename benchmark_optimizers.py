@@ -0,0 +1,121 @@
+# benchmark_optimizers.py
+# Evaluations-to-target benchmark: how many fitness evaluations (and how much wall
+# time) the DEAP GA and the bounded Brent baseline need to get within EPSILON m/s of
+# the optimum rb_ratio, on the GEO and FAR_ORBIT scenarios.
+#
+#   python benchmark_optimizers.py --epsilon 0.1 --seeds 10
+
+import argparse
+import json
+import os
+import random
+import time
+
+import numpy as np
+from deap import algorithms, tools
+import scipy.optimize  # noqa: F401  (imported here so it is not timed in the Brent runs)
+
+from ga_engine import (BiellipticProblem, R_EARTH, ea_early_stopping, make_stats, make_toolbox,
+                       optimize_bounded)
+from scenario_sweep import PRESETS
+
+RB_BOUNDS = (1.01, 500.0)
+
+
+def reference_optimum(problem, rb_bounds=RB_BOUNDS, n_grid=200001):
+    """Best fitness on a dense log grid over the bounds (end points included)."""
+    grid = np.geomspace(rb_bounds[0], rb_bounds[1], n_grid)
+    best = min(f for (f,) in problem.evaluate_population(grid[:, None]))
+    problem.reset_counter()
+    return best
+
+
+def to_target(problem, target, start):
+    """(evaluations, seconds) when the best-so-far first reached `target`; None if never."""
+    for evaluations, best, stamp in problem.trace:
+        if best <= target:
+            return evaluations, stamp - start
+    return None, None
+
+
+def bench_ga(problem, target, seed, pop_size=50, ngen=40, stall_generations=None):
+    random.seed(seed)
+    problem.reset_counter()
+    toolbox = make_toolbox(problem, RB_BOUNDS)
+    pop = toolbox.population(n=pop_size)
+    hof = tools.HallOfFame(1)
+    start = time.perf_counter()
+    if stall_generations is None:
+        algorithms.eaSimple(pop, toolbox, cxpb=0.7, mutpb=0.2, ngen=ngen, stats=make_stats(),
+                            halloffame=hof, verbose=False)
+    else:
+        ea_early_stopping(pop, toolbox, 0.7, 0.2, ngen, make_stats(), hof, stall_generations)
+    total_time = time.perf_counter() - start
+    evaluations, seconds = to_target(problem, target, start)
+    return {"method": "GA", "seed": seed, "evals_to_target": evaluations, "time_to_target_s": seconds,
+            "total_evals": problem.evaluations, "total_time_s": total_time, "best": problem.best}
+
+
+def bench_brent(problem, target):
+    problem.reset_counter()
+    start = time.perf_counter()
+    optimize_bounded(problem.evaluate_population, RB_BOUNDS)
+    total_time = time.perf_counter() - start
+    evaluations, seconds = to_target(problem, target, start)
+    return {"method": "BRENT", "seed": None, "evals_to_target": evaluations, "time_to_target_s": seconds,
+            "total_evals": problem.evaluations, "total_time_s": total_time, "best": problem.best}
+
+
+def summarize(rows):
+    reached = [r for r in rows if r["evals_to_target"] is not None]
+    return {
+        "runs": len(rows),
+        "reached": len(reached),
+        "median_evals_to_target": float(np.median([r["evals_to_target"] for r in reached])) if reached else None,
+        "median_time_to_target_s": float(np.median([r["time_to_target_s"] for r in reached])) if reached else None,
+        "median_total_evals": float(np.median([r["total_evals"] for r in rows])),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GA vs bounded Brent: evaluations to reach the optimum.")
+    parser.add_argument('--epsilon', type=float, default=0.1, help="Tolerance on Delta-V (m/s).")
+    parser.add_argument('--seeds', type=int, default=10)
+    parser.add_argument('--stall', type=int, default=None)
+    parser.add_argument('--output', default=os.path.join('results', 'benchmark_optimizers.json'))
+    args = parser.parse_args()
+
+    report = {"epsilon_m_s": args.epsilon, "scenarios": {}}
+    for name in ('GEO', 'FAR_ORBIT'):
+        altitude, r_target = PRESETS[name]
+        problem = BiellipticProblem(R_EARTH + altitude, r_target, trace=True)
+        optimum = reference_optimum(problem)
+        target = optimum + args.epsilon
+        ga_rows = [bench_ga(problem, target, seed, stall_generations=args.stall) for seed in range(args.seeds)]
+        brent_rows = [bench_brent(problem, target)]
+        report["scenarios"][name] = {
+            "optimum_m_s": optimum,
+            "GA": summarize(ga_rows),
+            "BRENT": summarize(brent_rows),
+            "runs": ga_rows + brent_rows,
+        }
+        print(f"\n--- {name}: optimum {optimum:.3f} m/s (epsilon {args.epsilon} m/s) ---")
+        for method in ('GA', 'BRENT'):
+            s = report["scenarios"][name][method]
+            evals = s["median_evals_to_target"]
+            seconds = s["median_time_to_target_s"]
+            print(f"{method:6s} reached {s['reached']}/{s['runs']}, "
+                  f"median evals to target: {evals if evals is not None else '-'}, "
+                  f"median time: {f'{seconds * 1e3:.3f} ms' if seconds is not None else '-'}, "
+                  f"median total evals: {s['median_total_evals']:.0f}")
+
+    directory = os.path.dirname(args.output)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n-> Benchmark saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
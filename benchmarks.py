@@ -0,0 +1,264 @@
+# benchmarks.py
+# Benchmark suite for the project's hot paths: poliastro maneuver construction and
+# cost, propagation, sampling, Lambert, the station-keeping environment step (both
+# physics modes) and plotly image export, each at several batch sizes (plus the
+# closed-form kernels the GA uses instead of poliastro). Results are saved as JSON baselines that later runs
+# can be compared against to spot regressions and measure optimization wins.
+#
+#   python benchmarks.py --output results/benchmarks/baseline.json
+#   python benchmarks.py --cases env_step orbit_propagate --compare results/benchmarks/baseline.json
+#
+# A case whose dependencies are not installed is recorded as skipped.
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from ga_engine import K_EARTH, R_EARTH
+from scenario_sweep import PRESETS
+
+# LEO -> GEO / FAR_ORBIT scenario radii of the paper scripts (km), taken from the sweep presets
+R_LEO = R_EARTH + PRESETS['GEO'][0]
+R_GEO = PRESETS['GEO'][1]
+R_FAR = PRESETS['FAR_ORBIT'][1]
+
+
+# --- Case setups: setup(n) -> zero-argument callable doing n operations ---
+def _leo_orbit():
+    import astropy.units as u
+    from poliastro.bodies import Earth
+    from poliastro.twobody import Orbit
+    return Orbit.circular(Earth, alt=400 * u.km)
+
+
+def _iss_orbit():
+    import astropy.units as u
+    from astropy.time import Time
+    from poliastro.bodies import Earth
+    from poliastro.twobody import Orbit
+    # Same state vector as lesson2_propagation.py
+    return Orbit.from_vectors(Earth, [-2384.46, 5729.01, 3050.46] * u.km, [-7.37, -2.98, 1.64] * u.km / u.s,
+                              epoch=Time("2024-01-01 12:00:00", scale="utc"))
+
+
+def setup_maneuver_hohmann(n):
+    import astropy.units as u
+    from poliastro.maneuver import Maneuver
+    leo = _leo_orbit()
+    targets = np.linspace(R_GEO, R_FAR, n) * u.km
+    return lambda: [Maneuver.hohmann(leo, r) for r in targets]
+
+
+def setup_maneuver_bielliptic(n):
+    import astropy.units as u
+    from poliastro.maneuver import Maneuver
+    leo = _leo_orbit()
+    apoapsides = np.geomspace(1.01, 500.0, n) * R_FAR * u.km
+    r_target = R_FAR * u.km
+    return lambda: [Maneuver.bielliptic(leo, rb, r_target) for rb in apoapsides]
+
+
+def setup_get_total_cost(n):
+    maneuvers = setup_maneuver_bielliptic(n)()
+    return lambda: [m.get_total_cost() for m in maneuvers]
+
+
+def setup_orbit_propagate(n):
+    import astropy.units as u
+    orbit = _iss_orbit()
+    times = np.linspace(1.0, 90.0, n) * u.min
+    return lambda: [orbit.propagate(t) for t in times]
+
+
+def setup_propagate_to_anomaly(n):
+    import astropy.units as u
+    orbit = _iss_orbit()
+    anomalies = np.linspace(-170.0, 170.0, n) * u.deg
+    return lambda: [orbit.propagate_to_anomaly(nu) for nu in anomalies]
+
+
+def setup_orbit_sample(n):
+    orbit = _iss_orbit()
+    return lambda: orbit.sample(n)
+
+
+def setup_lambert(n):
+    import astropy.units as u
+    from poliastro.bodies import Earth
+    from poliastro.iod import lambert
+    r0 = [R_LEO, 0.0, 0.0] * u.km
+    r = [0.0, R_GEO, 0.0] * u.km
+    tofs = np.linspace(3.0, 12.0, n) * u.h
+    return lambda: [lambert(Earth.k, r0, r, tof, prograde=True) for tof in tofs]
+
+
+def setup_env_step(n, physics='poliastro', **env_kwargs):
+    from project_drl import StationKeepingEnv
+    env = StationKeepingEnv(physics=physics, **env_kwargs)
+    actions = np.random.default_rng(0).integers(0, 2, n)
+
+    def run():
+        env.reset(seed=0)
+        for action in actions:
+            _, _, terminated, truncated, _ = env.step(action)
+            if terminated or truncated:
+                env.reset()
+    return run
+
+
+def setup_env_step_analytic(n):
+    return setup_env_step(n, physics='analytic')
+
+
+def setup_env_step_drag(n):
+    return setup_env_step(n, physics='analytic', decay_model='drag')
+
+
+def setup_write_image(n):
+    import kaleido  # noqa: F401  (write_image needs it; fail here so the case is skipped)
+    import plotly.graph_objects as go
+    nu = np.linspace(0.0, 2 * np.pi, n)
+    fig = go.Figure(go.Scatter3d(x=R_LEO * np.cos(nu), y=R_LEO * np.sin(nu), z=np.zeros(n), mode='lines'))
+    path = os.path.join(tempfile.mkdtemp(), "benchmark.png")
+    return lambda: fig.write_image(path, width=800, height=600)
+
+
+def setup_kernel_bielliptic(n):
+    from transfer_kernels import bielliptic_cost
+    rb_ratio = np.geomspace(1.01, 500.0, n)
+    return lambda: bielliptic_cost(K_EARTH, R_LEO, rb_ratio, R_FAR)
+
+
+def setup_kernel_hohmann(n):
+    from transfer_kernels import hohmann_cost
+    targets = np.linspace(R_GEO, R_FAR, n)
+    return lambda: hohmann_cost(K_EARTH, R_LEO, targets)
+
+
+# name -> (setup, batch sizes, unit of one operation)
+CASES = {
+    "maneuver_hohmann": (setup_maneuver_hohmann, (1, 10, 100), "maneuver"),
+    "maneuver_bielliptic": (setup_maneuver_bielliptic, (1, 10, 100), "maneuver"),
+    "get_total_cost": (setup_get_total_cost, (1, 10, 100), "maneuver"),
+    "orbit_propagate": (setup_orbit_propagate, (1, 10, 100), "propagation"),
+    "propagate_to_anomaly": (setup_propagate_to_anomaly, (1, 10, 100), "propagation"),
+    "orbit_sample": (setup_orbit_sample, (10, 100, 1000), "point"),
+    "lambert": (setup_lambert, (1, 10, 100), "solution"),
+    "env_step": (setup_env_step, (10, 100, 1000), "step"),
+    "env_step_analytic": (setup_env_step_analytic, (10, 100, 1000, 10000), "step"),
+    "env_step_drag": (setup_env_step_drag, (10, 100, 1000, 10000), "step"),
+    "write_image": (setup_write_image, (100, 1000, 10000), "point"),
+    "kernel_bielliptic": (setup_kernel_bielliptic, (1, 1000, 1000000), "transfer"),
+    "kernel_hohmann": (setup_kernel_hohmann, (1, 1000, 1000000), "transfer"),
+}
+
+
+def time_case(setup, n, repeats=5):
+    """Setup, one warm-up call (numba JIT, caches) then the best / median of `repeats` calls."""
+    func = setup(n)
+    t0 = time.perf_counter()
+    func()
+    first = time.perf_counter() - t0
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - t0)
+    best = min(times)
+    return {"n": n, "first_s": first, "best_s": best, "median_s": float(np.median(times)),
+            "per_op_s": best / n, "ops_per_s": n / best if best > 0 else None}
+
+
+def run_suite(names=None, repeats=5, max_size=None):
+    results = {}
+    for name in names or CASES:
+        setup, sizes, unit = CASES[name]
+        sizes = [n for n in sizes if max_size is None or n <= max_size]
+        try:
+            runs = []
+            for n in sizes:
+                runs.append(time_case(setup, n, repeats))
+                print(f"{name:22s} n={n:<8d} best {runs[-1]['best_s']:.6f} s "
+                      f"({runs[-1]['per_op_s'] * 1e6:.2f} us / {unit})")
+            results[name] = {"unit": unit, "runs": runs}
+        except ImportError as e:
+            print(f"{name:22s} skipped: {e}")
+            results[name] = {"unit": unit, "skipped": str(e)}
+    return results
+
+
+def environment():
+    versions = {}
+    for module in ("numpy", "scipy", "astropy", "poliastro", "numba", "deap", "gymnasium", "plotly", "kaleido"):
+        try:
+            versions[module] = __import__(module).__version__
+        except Exception:
+            versions[module] = None
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {"python": sys.version.split()[0], "platform": platform.platform(), "machine": platform.machine(),
+            "cpu_count": os.cpu_count(), "commit": commit, "versions": versions,
+            "date": datetime.now(timezone.utc).isoformat(timespec='seconds')}
+
+
+def compare(current, baseline, tolerance=0.2):
+    """Per case and size: current / baseline best time. Returns the regressions (> 1 + tolerance)."""
+    regressions = []
+    for name, result in current["cases"].items():
+        old = baseline["cases"].get(name)
+        if "runs" not in result or not old or "runs" not in old:
+            continue
+        old_runs = {run["n"]: run for run in old["runs"]}
+        for run in result["runs"]:
+            if run["n"] not in old_runs:
+                continue
+            ratio = run["best_s"] / old_runs[run["n"]]["best_s"]
+            flag = "REGRESSION" if ratio > 1 + tolerance else ("faster" if ratio < 1 - tolerance else "")
+            print(f"{name:22s} n={run['n']:<8d} {ratio:6.2f}x baseline time {flag}")
+            if ratio > 1 + tolerance:
+                regressions.append((name, run["n"], ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark suite for the project's hot paths.")
+    parser.add_argument('--cases', nargs='+', default=None, choices=sorted(CASES))
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--max-size', type=int, default=None, help="Skip batch sizes above this (quick runs).")
+    parser.add_argument('--output', default=os.path.join('results', 'benchmarks', 'latest.json'))
+    parser.add_argument('--compare', default=None, help="Baseline JSON to compare against.")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="Relative slow-down reported as a regression.")
+    args = parser.parse_args()
+
+    print(f"--- Benchmark suite ({args.repeats} repeats, best time) ---")
+    report = {"environment": environment(), "repeats": args.repeats,
+              "cases": run_suite(args.cases, args.repeats, args.max_size)}
+    directory = os.path.dirname(args.output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=1)
+    print(f"-> Results saved to: {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\n--- Comparison with {args.compare} (commit {baseline['environment'].get('commit')}) ---")
+        regressions = compare(report, baseline, args.tolerance)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
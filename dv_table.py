@@ -0,0 +1,168 @@
+# dv_table.py
+# Precomputed bi-elliptic / Hohmann cost table over the two dimensionless ratios
+#   R = r_target / r_initial      and      B = r_b / r_target.
+# In units of the initial circular orbit (r_initial = 1, k = 1) the Delta-V is a
+# function of (R, B) only, so one table serves every LEO/GEO/FAR_ORBIT setup:
+#   dv  = dv_norm(R, B) * sqrt(k / r_initial)
+#   tof = tof_norm(R, B) * sqrt(r_initial**3 / k)
+# The table is stored as a .npy file opened with mmap_mode='r' and read with
+# bilinear interpolation on a log-uniform grid (constant time per lookup).
+
+import json
+import os
+
+import numpy as np
+
+from transfer_kernels import bielliptic_impulses
+
+DEFAULT_PATH = os.path.join('results', 'dv_table.npy')
+
+
+def _meta_path(path):
+    return os.path.splitext(path)[0] + '.json'
+
+
+def _normalized_cost(R, B):
+    """Exact normalized (dv, log tof) of the bi-elliptic transfer, r_initial = k = 1."""
+    (dv_a, dv_b, dv_c), (t1, t2) = bielliptic_impulses(1.0, 1.0, B * R, R)
+    return dv_a + dv_b + dv_c, np.log(t1 + t2)
+
+
+def build_table(path=DEFAULT_PATH, r_ratio_range=(1.0, 200.0), rb_ratio_range=(1.0, 1000.0),
+                shape=(512, 2048)):
+    """Compute the table, write it to `path` (+ a .json sidecar) and return a DeltaVTable."""
+    n_r, n_b = shape
+    log_r = np.linspace(np.log(r_ratio_range[0]), np.log(r_ratio_range[1]), n_r)
+    log_b = np.linspace(np.log(rb_ratio_range[0]), np.log(rb_ratio_range[1]), n_b)
+    R, B = np.meshgrid(np.exp(log_r), np.exp(log_b), indexing='ij')
+    dv, log_tof = _normalized_cost(R, B)
+
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    np.save(path, np.stack([dv, log_tof]))
+    meta = {
+        "r_ratio_range": list(r_ratio_range),
+        "rb_ratio_range": list(rb_ratio_range),
+        "shape": [n_r, n_b],
+    }
+    with open(_meta_path(path), 'w') as f:
+        json.dump(meta, f)
+
+    table = DeltaVTable(path)
+    # Worst case of bilinear interpolation is at cell centres: store that bound
+    meta["error_bound"] = table.interpolation_error()
+    with open(_meta_path(path), 'w') as f:
+        json.dump(meta, f)
+    table.error_bound = meta["error_bound"]
+    return table
+
+
+def load_table(path=DEFAULT_PATH, **build_kwargs):
+    """Open an existing table, building it first if the file does not exist yet."""
+    if not (os.path.exists(path) and os.path.exists(_meta_path(path))):
+        return build_table(path, **build_kwargs)
+    return DeltaVTable(path)
+
+
+class DeltaVTable:
+    def __init__(self, path=DEFAULT_PATH):
+        with open(_meta_path(path)) as f:
+            meta = json.load(f)
+        self.path = path
+        self.data = np.load(path, mmap_mode='r')  # shape (2, n_r, n_b): dv, log(tof)
+        self.n_r, self.n_b = meta["shape"]
+        self.log_r0, log_r1 = np.log(meta["r_ratio_range"])
+        self.log_b0, log_b1 = np.log(meta["rb_ratio_range"])
+        self.dlog_r = (log_r1 - self.log_r0) / (self.n_r - 1)
+        self.dlog_b = (log_b1 - self.log_b0) / (self.n_b - 1)
+        self.error_bound = meta.get("error_bound")
+
+    def _lookup(self, R, B):
+        """Bilinear interpolation of both layers; NaN outside the tabulated range."""
+        x = (np.log(R) - self.log_r0) / self.dlog_r
+        y = (np.log(B) - self.log_b0) / self.dlog_b
+        inside = (x >= 0) & (x <= self.n_r - 1) & (y >= 0) & (y <= self.n_b - 1)
+        x = np.where(inside, x, 0.0)
+        y = np.where(inside, y, 0.0)
+        i = np.minimum(x.astype(np.intp), self.n_r - 2)
+        j = np.minimum(y.astype(np.intp), self.n_b - 2)
+        fx = x - i
+        fy = y - j
+        d = self.data
+        values = ((1 - fx) * (1 - fy) * d[:, i, j] + fx * (1 - fy) * d[:, i + 1, j]
+                  + (1 - fx) * fy * d[:, i, j + 1] + fx * fy * d[:, i + 1, j + 1])
+        values = np.where(inside, values, np.nan)
+        return values[0], np.exp(values[1]), inside
+
+    def bielliptic(self, k, r_initial, rb_ratio, r_target):
+        """Same contract as transfer_kernels.bielliptic_cost: (dv km/s, tof s, valid)."""
+        rb_ratio = np.asarray(rb_ratio, dtype=float)
+        valid = rb_ratio > 1.0
+        R = np.broadcast_to(np.asarray(r_target / r_initial, dtype=float), rb_ratio.shape)
+        dv, tof, inside = self._lookup(R, np.where(valid, rb_ratio, 1.0))
+        valid &= inside
+        v_scale = np.sqrt(k / r_initial)
+        t_scale = np.sqrt(r_initial**3 / k)
+        return np.where(valid, dv * v_scale, np.nan), np.where(valid, tof * t_scale, np.nan), valid
+
+    def hohmann(self, k, r_initial, r_target):
+        """
+        Hohmann cost from the B = 1 column: the bi-elliptic transfer with r_b = r_target
+        is a Hohmann transfer followed by half a revolution on the target orbit.
+        """
+        R = np.asarray(r_target / r_initial, dtype=float)
+        dv, tof, _ = self._lookup(R, np.ones_like(R))
+        tof = tof - np.pi * R**1.5
+        return dv * np.sqrt(k / r_initial), tof * np.sqrt(r_initial**3 / k)
+
+    def interpolation_error(self):
+        """
+        Max interpolation error at the centres of all grid cells: dv error as a
+        fraction of the initial circular speed (dv itself goes to 0 at R = B = 1),
+        tof error relative to tof.
+        """
+        log_r = self.log_r0 + (np.arange(self.n_r - 1) + 0.5) * self.dlog_r
+        log_b = self.log_b0 + (np.arange(self.n_b - 1) + 0.5) * self.dlog_b
+        R, B = np.meshgrid(np.exp(log_r), np.exp(log_b), indexing='ij')
+        dv_exact, log_tof_exact = _normalized_cost(R, B)
+        dv, tof, _ = self._lookup(R, B)
+        err_dv = np.max(np.abs(dv - dv_exact))
+        err_tof = np.max(np.abs(tof - np.exp(log_tof_exact)) / np.exp(log_tof_exact))
+        return float(max(err_dv, err_tof))
+
+    def check_against_poliastro(self, n_samples=200, seed=0):
+        """
+        Compare random table lookups with Maneuver.bielliptic and return the max
+        relative error on total Delta-V and flight time.
+        """
+        import astropy.units as u
+        from poliastro.bodies import Earth
+        from poliastro.twobody import Orbit
+        from poliastro.maneuver import Maneuver
+
+        rng = np.random.default_rng(seed)
+        k = Earth.k.to_value(u.km**3 / u.s**2)
+        log_r1 = self.log_r0 + self.dlog_r * (self.n_r - 1)
+        log_b1 = self.log_b0 + self.dlog_b * (self.n_b - 1)
+        worst = 0.0
+        for _ in range(n_samples):
+            alt = rng.uniform(200.0, 2000.0)
+            orbit = Orbit.circular(Earth, alt=alt * u.km)
+            r_initial = orbit.r_p.to_value(u.km)
+            R = np.exp(rng.uniform(self.log_r0, log_r1))
+            B = np.exp(rng.uniform(self.log_b0, log_b1))
+            maneuver = Maneuver.bielliptic(orbit, B * R * r_initial * u.km, R * r_initial * u.km)
+            dv_true = maneuver.get_total_cost().to_value(u.km / u.s)
+            tof_true = maneuver.get_total_time().to_value(u.s)
+            dv, tof, valid = self.bielliptic(k, r_initial, B, R * r_initial)
+            if valid:
+                worst = max(worst, abs(dv - dv_true) / dv_true, abs(tof - tof_true) / tof_true)
+        return worst
+
+
+if __name__ == "__main__":
+    table = load_table()
+    print(f"Lookup table: {table.path}, grid {table.n_r} x {table.n_b}")
+    print(f"Interpolation error bound (grid cell centres): {table.error_bound:.2e}")
+    print(f"Max relative error vs Maneuver.bielliptic: {table.check_against_poliastro():.2e}")
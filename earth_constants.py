@@ -0,0 +1,7 @@
+# earth_constants.py
+# Earth constants shared by the GA (ga_engine.py) and the station-keeping kernels
+# (station_keeping_kernels.py), so the two cannot drift apart. Same values as
+# poliastro.bodies.Earth, kept as plain floats.
+
+K_EARTH = 398600.4418  # gravitational parameter, km^3/s^2
+R_EARTH = 6378.1366  # equatorial radius, km
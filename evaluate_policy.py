@@ -0,0 +1,188 @@
+# evaluate_policy.py
+# Parallel multi-seed evaluation of station-keeping policies. Instead of the single
+# deterministic episode at the end of project_drl.py, every policy is rolled out over
+# many episodes (seed, initial altitude) spread over worker processes. Each worker
+# loads a policy once and plays a chunk of episodes. Per-episode metrics:
+# time-in-band fraction, thrusts and Delta-V spent, failure (altitude below the
+# critical one), reward. They are aggregated into means with confidence intervals,
+# plus episodes/sec.
+#
+# Every policy plays the same episodes, so policies are compared with paired
+# differences, which need far fewer episodes than independent samples. With
+# --target-ci, episodes are added in rounds until the CI of the time in band is
+# narrow enough, so comparisons stop as soon as they are statistically meaningful.
+#
+#   python evaluate_policy.py ppo_station_keeping --episodes 200 --workers 16
+#   python evaluate_policy.py ppo_a ppo_b never --altitude-spread 4 --target-ci 0.01 --max-episodes 2000
+#
+# Policies are saved PPO models, or the baselines 'never' (no thrust) and 'random'.
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import astropy.units as u
+import numpy as np
+
+from batch_runner import confidence_interval
+from multi_fidelity import model_policy, random_policy, run_episode
+from project_drl import StationKeepingEnv
+from results_store import ColumnStore
+from rollout_store import TrajectoryRecorder
+from scenario_sweep import write_table
+
+METRICS = ["time_in_band", "thrusts", "dv_m_s", "failed", "reward", "steps"]
+
+
+@lru_cache(maxsize=None)
+def _load_policy(name):
+    # Once per worker process and policy
+    if name == "never":
+        return lambda obs: 0
+    from stable_baselines3 import PPO
+    return model_policy(PPO.load(name, device='cpu'))
+
+
+def _evaluate_chunk(args):
+    index, name, episodes, env_kwargs, max_steps, record_dir = args
+    env = StationKeepingEnv(**env_kwargs)
+    thrust = float(env.thrust_magnitude.to_value(u.m / u.s))
+    recorder = None
+    if record_dir is not None:
+        # Keyed on the policy's position too: runs/a/ppo and runs/b/ppo share a basename
+        policy_dir = f"{index}-{os.path.basename(os.path.normpath(name))}"
+        recorder = TrajectoryRecorder(os.path.join(record_dir, policy_dir, f"part-{os.getpid()}"))
+    rows = []
+    try:
+        for episode, seed, altitude in episodes:
+            # The random baseline is seeded per episode, so it does not depend on the chunking
+            policy = random_policy(0.3, seed) if name == "random" else _load_policy(name)
+            t0 = time.perf_counter()
+            result = run_episode(policy, env, seed=seed, max_steps=max_steps, recorder=recorder, episode=episode,
+                                 options={"altitude": altitude})
+            rows.append({"policy": name, "episode": episode, "seed": seed, "initial_altitude": altitude,
+                         "steps": result["steps"], "reward": result["reward"],
+                         "time_in_band": result["time_in_band"], "thrusts": result["thrusts"],
+                         "dv_m_s": result["thrusts"] * thrust, "failed": float(result["terminated"]),
+                         "wall_time_s": time.perf_counter() - t0})
+    finally:
+        if recorder is not None:
+            recorder.close()
+    return rows
+
+
+def make_episodes(n, start=0, base_seed=0, altitude_spread=0.0, target_altitude=400.0):
+    """
+    Episodes start .. start + n - 1 as (episode, seed, initial altitude). The initial
+    altitude is drawn uniformly within target +- altitude_spread km from the episode's
+    seed, so the same episode always starts from the same state.
+    """
+    episodes = []
+    for episode in range(start, start + n):
+        seed = base_seed + episode
+        offset = np.random.default_rng(seed).uniform(-altitude_spread, altitude_spread) if altitude_spread else 0.0
+        episodes.append((episode, seed, target_altitude + offset))
+    return episodes
+
+
+def evaluate(policies, episodes, workers=None, env_kwargs=None, max_steps=None, record_dir=None):
+    """Play every episode with every policy, in parallel. Returns one row per (policy, episode)."""
+    workers = workers or os.cpu_count()
+    # A few chunks per worker and policy: models are loaded once per chunk's worker
+    chunk = max(1, len(episodes) // (workers * 2))
+    tasks = [(index, name, episodes[i:i + chunk], env_kwargs or {}, max_steps, record_dir)
+             for index, name in enumerate(policies) for i in range(0, len(episodes), chunk)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [row for rows in pool.map(_evaluate_chunk, tasks) for row in rows]
+
+
+def aggregate(rows, confidence=0.95):
+    """One summary row per policy, with paired differences to the first policy."""
+    policies = list(dict.fromkeys(r["policy"] for r in rows))
+    by_policy = {name: sorted((r for r in rows if r["policy"] == name), key=lambda r: r["episode"])
+                 for name in policies}
+    summary = []
+    for name in policies:
+        runs = by_policy[name]
+        row = {"policy": name, "episodes": len(runs)}
+        for metric in METRICS:
+            mean, half_width = confidence_interval([r[metric] for r in runs], confidence)
+            row[f"{metric}_mean"] = mean
+            row[f"{metric}_ci"] = half_width
+        # Same episodes for every policy: paired differences (0 for the first policy)
+        for metric in ("time_in_band", "dv_m_s", "failed"):
+            diff = [r[metric] - ref[metric] for r, ref in zip(runs, by_policy[policies[0]])]
+            mean, half_width = confidence_interval(diff, confidence)
+            row[f"{metric}_diff"] = mean
+            row[f"{metric}_diff_ci"] = half_width
+        summary.append(row)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel multi-seed evaluation of station-keeping policies.")
+    parser.add_argument('policies', nargs='+', help="Saved PPO models, or the baselines 'never' / 'random'.")
+    parser.add_argument('--episodes', type=int, default=100, help="Episodes per policy (per round with --target-ci).")
+    parser.add_argument('--target-ci', type=float, default=None,
+                        help="Add rounds until the CI half-width of the time in band is below this.")
+    parser.add_argument('--max-episodes', type=int, default=1000)
+    parser.add_argument('--base-seed', type=int, default=0)
+    parser.add_argument('--altitude-spread', type=float, default=0.0,
+                        help="Initial altitudes drawn within target +- this (km).")
+    parser.add_argument('--max-steps', type=int, default=None, help="Cut episodes after this many steps.")
+    parser.add_argument('--physics', default='analytic', choices=['poliastro', 'analytic'])
+    parser.add_argument('--decay-model', default='constant', choices=['constant', 'drag'])
+    parser.add_argument('--f107', type=float, default=150.0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--confidence', type=float, default=0.95)
+    parser.add_argument('--output', default=os.path.join('results', 'policy_evaluation.csv'))
+    parser.add_argument('--record', default=None, help="Spill every trajectory to this directory (rollout_store.py).")
+    parser.add_argument('--log', default=None, help="Also append the episode rows to this results store.")
+    args = parser.parse_args()
+
+    env_kwargs = {"physics": args.physics, "decay_model": args.decay_model, "f107": args.f107}
+    print(f"--- Policy evaluation: {', '.join(args.policies)} ({args.physics} physics, "
+          f"{args.decay_model} decay, initial altitude 400 +- {args.altitude_spread} km) ---")
+    start = time.perf_counter()
+    rows = []
+    while True:
+        episodes = make_episodes(min(args.episodes, args.max_episodes - len(rows) // len(args.policies)),
+                                 len(rows) // len(args.policies), args.base_seed, args.altitude_spread)
+        rows += evaluate(args.policies, episodes, args.workers, env_kwargs, args.max_steps, args.record)
+        summary = aggregate(rows, args.confidence)
+        widest = max(row["time_in_band_ci"] for row in summary)
+        n = summary[0]["episodes"]
+        if args.target_ci is None or widest <= args.target_ci or n >= args.max_episodes:
+            break
+        print(f"{n} episodes per policy: time-in-band CI +-{widest:.4f} > {args.target_ci}, adding a round")
+    elapsed = time.perf_counter() - start
+
+    write_table(rows, args.output)
+    summary_file = os.path.splitext(args.output)[0] + '_summary.csv'
+    write_table(summary, summary_file)
+    if args.log:
+        with ColumnStore(args.log) as store:
+            for row in rows:
+                store.append("evaluation", row)
+
+    pct = f"{args.confidence:.0%}"
+    for row in summary:
+        print(f"\n{row['policy']} ({row['episodes']} episodes)")
+        for metric in METRICS:
+            print(f"  {metric:14s} {row[metric + '_mean']:14.4f} ± {row[metric + '_ci']:.4f} ({pct} CI)")
+        for metric in ("time_in_band", "dv_m_s", "failed"):
+            if row is not summary[0]:
+                print(f"  {metric + ' - ' + summary[0]['policy']:14s} {row[metric + '_diff']:+14.4f} "
+                      f"± {row[metric + '_diff_ci']:.4f} (paired, {pct} CI)")
+    total_steps = sum(r["steps"] for r in rows)
+    print(f"\n{len(rows)} episodes ({total_steps:,d} steps) in {elapsed:.2f} s: "
+          f"{len(rows) / elapsed:.1f} episodes/s, {total_steps / elapsed:,.0f} steps/s")
+    print(f"-> episodes: {args.output}, summary: {summary_file}")
+    if args.record:
+        print(f"-> Trajectories saved to: {args.record} (one <index>-<policy> folder per policy)")
+
+
+if __name__ == "__main__":
+    main()
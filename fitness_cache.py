@@ -0,0 +1,121 @@
+# fitness_cache.py
+# Memoizing fitness cache for the GA scripts. Keys are (scenario, quantized genes):
+# cxBlend / mutGaussian keep producing near-identical rb_ratio values, which all
+# land in the same bucket and are evaluated only once. Bounded size, LRU eviction.
+
+from collections import OrderedDict
+import json
+import os
+
+
+class FitnessCache:
+    def __init__(self, tolerance=1e-6, maxsize=100000):
+        """
+        tolerance: genes closer than this (absolute) share a cache entry.
+        maxsize: number of entries kept; the least recently used one is dropped first.
+        """
+        if tolerance <= 0:
+            raise ValueError("tolerance must be positive.")
+        self.tolerance = tolerance
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def key(self, scenario, genes):
+        return (scenario, tuple(int(round(g / self.tolerance)) for g in genes))
+
+    def get(self, key):
+        fitness = self._entries.get(key)
+        if fitness is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return fitness
+
+    def put(self, key, fitness):
+        self._entries[key] = tuple(fitness)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def wrap(self, evaluate, scenario):
+        """Cached version of a one-individual fitness function (toolbox "evaluate")."""
+        def cached_evaluate(individual):
+            key = self.key(scenario, individual)
+            fitness = self.get(key)
+            if fitness is None:
+                fitness = evaluate(individual)
+                self.put(key, fitness)
+            return fitness
+        return cached_evaluate
+
+    def evaluate_many(self, scenario, individuals, evaluate_population):
+        """
+        Cached version of a batched fitness function: hits are answered from the
+        cache, all misses are sent to evaluate_population in a single call.
+        """
+        individuals = list(individuals)
+        keys = [self.key(scenario, ind) for ind in individuals]
+        results = [self.get(key) for key in keys]
+        missing = [i for i, fitness in enumerate(results) if fitness is None]
+        if missing:
+            # Duplicates inside one generation are evaluated once as well
+            first = {}
+            for i in missing:
+                first.setdefault(keys[i], i)
+            todo = list(first.values())
+            computed = {}
+            for i, fitness in zip(todo, evaluate_population([individuals[i] for i in todo])):
+                computed[keys[i]] = tuple(fitness)
+                self.put(keys[i], fitness)
+            for i in missing:
+                results[i] = computed[keys[i]]
+        return results
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def register_stats(self, stats):
+        """Report the cumulative counters in the Logbook next to avg/min."""
+        stats.register("cache_hits", lambda _: self.hits)
+        stats.register("cache_misses", lambda _: self.misses)
+
+    # --- Checkpoints (ga_engine.ea_early_stopping) ---
+    def state(self):
+        """Entries in LRU order and hit / miss counters, so a resumed run sees the same cache."""
+        return {"tolerance": self.tolerance, "hits": self.hits, "misses": self.misses,
+                "entries": list(self._entries.items())}
+
+    def restore(self, state):
+        if state["tolerance"] != self.tolerance:
+            raise ValueError(f"Checkpointed cache tolerance {state['tolerance']} != {self.tolerance}.")
+        self._entries = OrderedDict(state["entries"])
+        self.hits, self.misses = state["hits"], state["misses"]
+
+    # --- Persistence (reuse across re-runs of the GEO / FAR_ORBIT scenarios) ---
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        entries = [[scenario, list(genes), list(fitness)]
+                   for (scenario, genes), fitness in self._entries.items()]
+        with open(path, 'w') as f:
+            json.dump({"tolerance": self.tolerance, "entries": entries}, f)
+
+    def load(self, path):
+        """Load entries saved with the same tolerance; returns the number loaded."""
+        if not os.path.exists(path):
+            return 0
+        with open(path) as f:
+            data = json.load(f)
+        if data["tolerance"] != self.tolerance:
+            return 0
+        for scenario, genes, fitness in data["entries"]:
+            self.put((scenario, tuple(genes)), fitness)
+        return len(data["entries"])
@@ -1,41 +1,46 @@
 # project_ga_final_for_paper_english.py (ENHANCED PLOT STYLING)
-
-import astropy.units as u
-from poliastro.bodies import Earth
-from poliastro.twobody import Orbit
-from poliastro.maneuver import Maneuver
-from poliastro.plotting import OrbitPlotter3D
+# Importing this module has no side effects: the poliastro scenario, the DEAP toolbox,
+# the results/ folder and the plotting stack (poliastro.plotting, plotly) are built or
+# imported on first use only, as in project_ga_final_for_paper_english.py.
 
 import numpy as np
 import random
 from deap import base, creator, tools, algorithms
 import os
-import plotly.graph_objects as go
+from functools import lru_cache
+from ga_engine import K_EARTH, R_EARTH, ensure_creator
+from scenario_sweep import PRESETS
+from transfer_kernels import batched_map, bielliptic_cost
 
 # ===================================================================
 # --- EXPERIMENT CONFIGURATION ---
 # ===================================================================
 SCENARIO = 'FAR_ORBIT' # <-- CHANGE TO 'GEO' TO RUN THE OTHER SCENARIO
-if not os.path.exists('results'):
-    os.makedirs('results')
 # ===================================================================
 
 # --- Problem Setup ---
-print(f"--- Starting experiment for scenario: {SCENARIO} ---")
-leo_orbit = Orbit.circular(Earth, alt=400 * u.km)
-if SCENARIO == 'GEO':
-    r_target = Earth.R + 35786 * u.km
-    target_orbit = Orbit.circular(Earth, r_target - Earth.R)
-elif SCENARIO == 'FAR_ORBIT':
-    r_target = 20 * leo_orbit.r_p
-    target_orbit = Orbit.circular(Earth, r_target - Earth.R)
-else:
-    raise ValueError("Invalid scenario. Please choose 'GEO' or 'FAR_ORBIT'.")
-print(f"Initial Orbit: LEO, radius {leo_orbit.r_p.to(u.km):.2f}")
-print(f"Target Orbit: radius {r_target.to(u.km):.2f}")
+@lru_cache(maxsize=None)
+def get_scenario():
+    """leo_orbit, r_target and target_orbit as poliastro objects, built on first use."""
+    import astropy.units as u
+    from poliastro.bodies import Earth
+    from poliastro.twobody import Orbit
+    leo_orbit = Orbit.circular(Earth, alt=400 * u.km)
+    if SCENARIO == 'GEO':
+        r_target = Earth.R + 35786 * u.km
+        target_orbit = Orbit.circular(Earth, r_target - Earth.R)
+    elif SCENARIO == 'FAR_ORBIT':
+        r_target = 20 * leo_orbit.r_p
+        target_orbit = Orbit.circular(Earth, r_target - Earth.R)
+    else:
+        raise ValueError("Invalid scenario. Please choose 'GEO' or 'FAR_ORBIT'.")
+    return leo_orbit, r_target, target_orbit
 
 # --- Fitness Function ---
 def evaluate_bielliptic(individual):
+    import astropy.units as u
+    from poliastro.maneuver import Maneuver
+    leo_orbit, r_target, _ = get_scenario()
     rb_ratio = individual[0]
     if rb_ratio <= 1.0: return 9999999,
     rb = rb_ratio * r_target
@@ -44,20 +49,46 @@ def evaluate_bielliptic(individual):
         return maneuver.get_total_cost().to_value(u.m / u.s),
     except Exception: return 9999999,
 
+# --- Batched Fitness (whole population in one vectorized call) ---
+# Plain-float radii (km) of the same scenario, so evaluation needs no poliastro
+_ALTITUDE_KM, R_TARGET_KM = PRESETS[SCENARIO]
+R_INITIAL_KM = R_EARTH + _ALTITUDE_KM
+
+def evaluate_population(individuals):
+    rb_ratio = np.fromiter((ind[0] for ind in individuals), dtype=float, count=len(individuals))
+    dv, _, valid = bielliptic_cost(K_EARTH, R_INITIAL_KM, rb_ratio, R_TARGET_KM)
+    return [(f,) for f in np.where(valid, dv * 1000.0, 9999999).tolist()]
+
 # --- Genetic Algorithm Setup (DEAP) ---
-creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
-creator.create("Individual", list, fitness=creator.FitnessMin)
-toolbox = base.Toolbox()
-toolbox.register("attr_rb_ratio", random.uniform, 1.01, 500.0)
-toolbox.register("individual", tools.initRepeat, creator.Individual, toolbox.attr_rb_ratio, n=1)
-toolbox.register("population", tools.initRepeat, list, toolbox.individual)
-toolbox.register("evaluate", evaluate_bielliptic)
-toolbox.register("mate", tools.cxBlend, alpha=0.5)
-toolbox.register("mutate", tools.mutGaussian, mu=0, sigma=10.0, indpb=0.2)
-toolbox.register("select", tools.selTournament, tournsize=3)
+@lru_cache(maxsize=None)
+def get_toolbox():
+    ensure_creator()  # creator.FitnessMin / creator.Individual, created once per process
+    toolbox = base.Toolbox()
+    toolbox.register("attr_rb_ratio", random.uniform, 1.01, 500.0)
+    toolbox.register("individual", tools.initRepeat, creator.Individual, toolbox.attr_rb_ratio, n=1)
+    toolbox.register("population", tools.initRepeat, list, toolbox.individual)
+    toolbox.register("evaluate", evaluate_bielliptic)
+    # eaSimple's map(toolbox.evaluate, invalid_ind) goes to the vectorized evaluator in one call
+    toolbox.register("map", batched_map(evaluate_bielliptic, evaluate_population))
+    toolbox.register("mate", tools.cxBlend, alpha=0.5)
+    toolbox.register("mutate", tools.mutGaussian, mu=0, sigma=10.0, indpb=0.2)
+    toolbox.register("select", tools.selTournament, tournsize=3)
+    return toolbox
 
 # --- Main Function to Run and Analyze ---
 def main():
+    import astropy.units as u
+    from poliastro.maneuver import Maneuver
+    from poliastro.plotting import OrbitPlotter3D
+    import plotly.graph_objects as go
+
+    if not os.path.exists('results'):
+        os.makedirs('results')
+    print(f"--- Starting experiment for scenario: {SCENARIO} ---")
+    leo_orbit, r_target, target_orbit = get_scenario()
+    print(f"Initial Orbit: LEO, radius {leo_orbit.r_p.to(u.km):.2f}")
+    print(f"Target Orbit: radius {r_target.to(u.km):.2f}")
+    toolbox = get_toolbox()
     pop = toolbox.population(n=50)
     hof = tools.HallOfFame(1)
     stats = tools.Statistics(lambda ind: ind.fitness.values)
@@ -0,0 +1,422 @@
+# ga_engine.py
+# Scenario-independent version of the bi-elliptic GA from
+# project_ga_final_for_paper_english.py. The scenario is a pair of radii (km)
+# instead of module globals, and the fitness uses the vectorized closed-form
+# kernel, so many scenarios can run side by side in worker processes.
+
+import gzip
+import os
+import pickle
+import random
+import time
+
+import numpy as np
+from deap import base, creator, tools
+
+from earth_constants import K_EARTH, R_EARTH  # re-exported: the GA scripts import them from here
+from ga_profiler import NULL_PROFILER, GenerationProfiler
+from transfer_kernels import batched_map, bielliptic_cost, bielliptic_impulses, hohmann_cost
+
+PENALTY = 9999999  # fitness (m/s) of invalid individuals, as in the paper scripts
+
+
+def ensure_creator():
+    """Create the DEAP FitnessMin / Individual classes once per process."""
+    if not hasattr(creator, "FitnessMin"):
+        creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
+    if not hasattr(creator, "Individual"):
+        creator.create("Individual", list, fitness=creator.FitnessMin)
+
+
+class BiellipticProblem:
+    """
+    Bi-elliptic rb_ratio problem between two circular orbits (radii in km).
+    Counts every fitness evaluation, whichever optimizer asks for it. With trace=True it
+    also keeps (evaluations, best so far, time) after each call, for benchmarks; off by
+    default, since long runs would grow it by one entry per evaluation call.
+    """
+
+    def __init__(self, r_initial, r_target, k=K_EARTH, trace=False):
+        self.r_initial = float(r_initial)
+        self.r_target = float(r_target)
+        self.k = k
+        self.tracing = trace
+        self.reset_counter()
+
+    def reset_counter(self):
+        self.evaluations = 0
+        self.best = np.inf
+        self.trace = []
+
+    def evaluate_array(self, genes):
+        """Fitness (m/s) of a (P, 1) gene array, as a float array (see array_ga.py)."""
+        rb_ratio = np.asarray(genes, dtype=float).reshape(len(genes), -1)[:, 0]
+        dv, _, valid = bielliptic_cost(self.k, self.r_initial, rb_ratio, self.r_target)
+        fitness = np.where(valid, dv * 1000.0, PENALTY)
+        self.evaluations += len(fitness)
+        if len(fitness):
+            self.best = min(self.best, float(fitness.min()))
+        if self.tracing:
+            self.trace.append((self.evaluations, self.best, time.perf_counter()))
+        return fitness
+
+    def evaluate_population(self, individuals):
+        rb_ratio = np.fromiter((ind[0] for ind in individuals), dtype=float, count=len(individuals))
+        return [(f,) for f in self.evaluate_array(rb_ratio[:, None]).tolist()]
+
+    def evaluate(self, individual):
+        return self.evaluate_population([individual])[0]
+
+    def map(self, func, individuals):
+        # Route eaSimple's map(evaluate, invalid_ind) to the batched evaluator
+        return batched_map(self.evaluate, self.evaluate_population)(func, individuals)
+
+    def summary(self, rb_ratio):
+        """Delta-V per impulse, totals and the Hohmann comparison for one rb_ratio."""
+        (dv_a, dv_b, dv_c), (t1, t2) = bielliptic_impulses(
+            self.k, self.r_initial, rb_ratio * self.r_target, self.r_target)
+        hohmann_dv, hohmann_tof = hohmann_cost(self.k, self.r_initial, self.r_target)
+        dv_total = float(dv_a + dv_b + dv_c) * 1000.0
+        return {
+            "rb_ratio": float(rb_ratio),
+            "dv_impulse_1": float(dv_a) * 1000.0,
+            "dv_impulse_2": float(dv_b) * 1000.0,
+            "dv_impulse_3": float(dv_c) * 1000.0,
+            "dv_total": dv_total,
+            "tof_days": float(t1 + t2) / 86400.0,
+            "hohmann_dv": float(hohmann_dv) * 1000.0,
+            "hohmann_tof_days": float(hohmann_tof) / 86400.0,
+            "savings_vs_hohmann": float(hohmann_dv) * 1000.0 - dv_total,
+        }
+
+
+def optimize_bounded(evaluate_population, rb_bounds=(1.01, 500.0), xatol=1e-6):
+    """
+    Deterministic baseline for the single rb_ratio gene: bounded Brent search
+    (golden section + parabolic steps). `evaluate_population` is the batched fitness
+    function the GA maps over (e.g. BiellipticProblem.evaluate_population), so both
+    optimizers are counted by, and optimize, the same function.
+    Returns the best rb_ratio found.
+    """
+    from scipy.optimize import minimize_scalar
+
+    result = minimize_scalar(lambda x: evaluate_population([[x]])[0][0], bounds=rb_bounds,
+                             method='bounded', options={'xatol': xatol})
+    return float(result.x)
+
+
+def make_toolbox(problem, rb_bounds=(1.01, 500.0), sigma=10.0, n_genes=1, gene_bounds=None):
+    """
+    Same operators and parameters as the English paper script. `n_genes` > 1 gives
+    individuals with several radius-ratio genes (see n_impulse.py). For genes of
+    different kinds, `gene_bounds` lists one (low, high) pair per gene and `sigma`
+    may be a list too (see plane_change.py).
+    """
+    ensure_creator()
+    toolbox = base.Toolbox()
+    if gene_bounds is None:
+        toolbox.register("attr_rb_ratio", random.uniform, *rb_bounds)
+        toolbox.register("individual", tools.initRepeat, creator.Individual, toolbox.attr_rb_ratio, n=n_genes)
+    else:
+        toolbox.register("genes", lambda: [random.uniform(low, high) for low, high in gene_bounds])
+        toolbox.register("individual", tools.initIterate, creator.Individual, toolbox.genes)
+    toolbox.register("population", tools.initRepeat, list, toolbox.individual)
+    toolbox.register("evaluate", problem.evaluate)
+    toolbox.register("map", problem.map)
+    toolbox.register("mate", tools.cxBlend, alpha=0.5)
+    toolbox.register("mutate", tools.mutGaussian, mu=0, sigma=sigma, indpb=0.2)
+    toolbox.register("select", tools.selTournament, tournsize=3)
+    return toolbox
+
+
+def make_stats():
+    stats = tools.Statistics(lambda ind: ind.fitness.values)
+    stats.register("avg", np.mean)
+    stats.register("min", np.min)
+    return stats
+
+
+# --- Checkpoints ---
+def save_checkpoint(path, state):
+    """
+    Write the loop state (population, hall of fame, logbook, RNG states, counters)
+    as a gzip-compressed pickle. The file is replaced atomically, so a crash while
+    writing leaves the previous checkpoint intact.
+    """
+    tmp_path = path + '.tmp'
+    with gzip.open(tmp_path, 'wb', compresslevel=1) as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path):
+    ensure_creator()  # the pickled individuals refer to creator.Individual
+    with gzip.open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def vary(offspring, toolbox, cxpb, mutpb, profiler=NULL_PROFILER):
+    """algorithms.varAnd with the clone / mate / mutate phases timed separately."""
+    with profiler.phase("clone"):
+        offspring = [toolbox.clone(ind) for ind in offspring]
+    with profiler.phase("mate"):
+        for i in range(1, len(offspring), 2):
+            if random.random() < cxpb:
+                offspring[i - 1], offspring[i] = toolbox.mate(offspring[i - 1], offspring[i])
+                del offspring[i - 1].fitness.values, offspring[i].fitness.values
+    with profiler.phase("mutate"):
+        for i in range(len(offspring)):
+            if random.random() < mutpb:
+                offspring[i], = toolbox.mutate(offspring[i])
+                del offspring[i].fitness.values
+    return offspring
+
+
+def ea_early_stopping(population, toolbox, cxpb, mutpb, ngen, stats=None, halloffame=None,
+                      stall_generations=5, rel_tol=1e-6, time_budget=None, verbose=False,
+                      checkpoint_path=None, checkpoint_every=10, profiler=None, writer=None,
+                      keep_logbook=True, cache=None):
+    """
+    Same generational loop as deap.algorithms.eaSimple, but stops before `ngen` when the
+    Hall-of-Fame best has not improved by more than `rel_tol` (relative) for
+    `stall_generations` generations (None: never), or when `time_budget` seconds
+    have elapsed. Returns (population, logbook, info); info holds the stop reason,
+    generations run, evaluations done and an estimate of the evaluations saved vs
+    eaSimple.
+
+    With `checkpoint_path`, the state is saved every `checkpoint_every` generations
+    and when the loop ends. If the file already exists the run resumes from it and
+    continues bit-identically (the RNG states are restored too); a checkpoint written
+    when the loop stopped (stall, time budget, or `ngen` reached) is final and the run
+    returns at once with its stop reason.
+    info then also reports the checkpoint count and the time spent writing them.
+    `cache` (a fitness_cache.FitnessCache used by toolbox.evaluate) is saved in the
+    checkpoints and restored with them, since its entries decide the fitness values.
+
+    `profiler` (a ga_profiler.GenerationProfiler) records per-phase timings and
+    evaluation counts for every generation.
+
+    `writer` (e.g. a results_store.ColumnStore) gets one "generations" row per
+    generation: the logbook record, the elapsed time and the profiler timings if any.
+    With keep_logbook=False the returned logbook only holds the last record, so memory
+    no longer grows with the number of generations.
+    """
+    if halloffame is None:
+        halloffame = tools.HallOfFame(1)
+    if profiler is None:
+        profiler = NULL_PROFILER
+    start = time.perf_counter()
+    checkpoint_time = 0.0
+    n_checkpoints = 0
+
+    if checkpoint_path is not None and os.path.exists(checkpoint_path):
+        state = load_checkpoint(checkpoint_path)
+        population[:] = state["population"]
+        halloffame.clear()
+        halloffame.update(state["halloffame"])
+        logbook = state["logbook"]
+        random.setstate(state["random_state"])
+        np.random.set_state(state["numpy_state"])
+        first_gen, best, stall = state["generation"] + 1, state["best"], state["stall"]
+        final_reason = state.get("stop_reason")
+        if final_reason == "ngen" and state["generation"] < ngen:
+            final_reason = None  # ended at a smaller ngen: extend the run
+        if cache is not None and "cache" in state:
+            cache.restore(state["cache"])
+        if "evaluations" in state:
+            evaluations, initial_evaluations = state["evaluations"], state["initial_evaluations"]
+            improvements = state["improvements"]
+        else:
+            # Checkpoint written before these counters existed: the logbook is complete
+            nevals = logbook.select("nevals")
+            evaluations, initial_evaluations = int(sum(nevals)), nevals[0]
+            improvements = _improvements(logbook.select("gen"), logbook.select("min"))
+        if verbose:
+            print(f"Resumed from {checkpoint_path} at generation {state['generation']}"
+                  + (f" (final, {final_reason})" if final_reason else ""))
+    else:
+        final_reason = None
+        logbook = tools.Logbook()
+        logbook.header = ['gen', 'nevals'] + (stats.fields if stats else [])
+
+        with profiler.phase("evaluate"):
+            invalid_ind = [ind for ind in population if not ind.fitness.valid]
+            fitnesses = toolbox.map(toolbox.evaluate, invalid_ind)
+            for ind, fit in zip(invalid_ind, fitnesses):
+                ind.fitness.values = fit
+        with profiler.phase("halloffame"):
+            halloffame.update(population)
+        with profiler.phase("stats"):
+            record = stats.compile(population) if stats else {}
+        logbook.record(gen=0, nevals=len(invalid_ind), **record)
+        timings = profiler.end_generation(0, len(invalid_ind), record)
+        if verbose:
+            print(logbook.stream)
+        if writer is not None:
+            writer.append("generations", _generation_row(0, len(invalid_ind), record, timings, start))
+        first_gen, best, stall = 1, halloffame[0].fitness.wvalues[0], 0
+        evaluations = initial_evaluations = len(invalid_ind)
+        improvements = [(0, halloffame[0].fitness.values[0])]
+
+    def checkpoint(gen, stop_reason=None):
+        nonlocal checkpoint_time, n_checkpoints
+        t0 = time.perf_counter()
+        save_checkpoint(checkpoint_path, {
+            "generation": gen, "population": population, "halloffame": list(halloffame),
+            "logbook": logbook, "random_state": random.getstate(),
+            "numpy_state": np.random.get_state(), "best": best, "stall": stall,
+            "evaluations": evaluations, "initial_evaluations": initial_evaluations,
+            "improvements": improvements, "stop_reason": stop_reason,
+            "cache": cache.state() if cache is not None else None,
+        })
+        checkpoint_time += time.perf_counter() - t0
+        n_checkpoints += 1
+
+    stop_reason = final_reason or "ngen"
+    # Resumed from a final checkpoint: the run already ended, nothing left to run or to write
+    last_gen = ngen if final_reason is None else first_gen - 1
+    gen = first_gen - 1
+    for gen in range(first_gen, last_gen + 1):
+        with profiler.phase("select"):
+            offspring = toolbox.select(population, len(population))
+        offspring = vary(offspring, toolbox, cxpb, mutpb, profiler)
+
+        with profiler.phase("evaluate"):
+            invalid_ind = [ind for ind in offspring if not ind.fitness.valid]
+            fitnesses = toolbox.map(toolbox.evaluate, invalid_ind)
+            for ind, fit in zip(invalid_ind, fitnesses):
+                ind.fitness.values = fit
+        with profiler.phase("halloffame"):
+            halloffame.update(offspring)
+        population[:] = offspring
+
+        with profiler.phase("stats"):
+            record = stats.compile(population) if stats else {}
+        logbook.record(gen=gen, nevals=len(invalid_ind), **record)
+        timings = profiler.end_generation(gen, len(invalid_ind), record)
+        if verbose:
+            print(logbook.stream)
+        if writer is not None:
+            writer.append("generations", _generation_row(gen, len(invalid_ind), record, timings, start))
+        if not keep_logbook:
+            logbook.pop(0)
+        evaluations += len(invalid_ind)
+
+        # wvalues are "higher is better" whatever the fitness weights are
+        new_best = halloffame[0].fitness.wvalues[0]
+        if new_best - best > rel_tol * abs(best):
+            stall = 0
+        else:
+            stall += 1
+        if new_best > best:
+            improvements.append((gen, halloffame[0].fitness.values[0]))
+        best = new_best
+        if stall_generations is not None and stall >= stall_generations:
+            stop_reason = "stall"
+            break
+        if time_budget is not None and time.perf_counter() - start >= time_budget:
+            stop_reason = "time_budget"
+            break
+        if checkpoint_path is not None and gen % checkpoint_every == 0:
+            checkpoint(gen)
+
+    if checkpoint_path is not None and final_reason is None:
+        checkpoint(gen, stop_reason)
+
+    per_gen = (evaluations - initial_evaluations) / gen if gen > 0 else initial_evaluations
+    final = improvements[-1][1]
+    info = {
+        "stop_reason": stop_reason,
+        "generations_run": gen,
+        "evaluations": int(evaluations),
+        "evaluations_saved": int(round(per_gen * (ngen - gen))),
+        "convergence_generation": next(g for g, value in improvements
+                                       if value <= final + rel_tol * abs(final)),
+        "checkpoints": n_checkpoints,
+        "checkpoint_time_s": checkpoint_time,
+        "loop_time_s": time.perf_counter() - start,
+    }
+    if verbose:
+        print(f"Stopped after {gen}/{ngen} generations ({stop_reason}), "
+              f"~{info['evaluations_saved']} evaluations saved.")
+        if checkpoint_path is not None:
+            print(f"{n_checkpoints} checkpoints written in {checkpoint_time:.3f} s "
+                  f"({checkpoint_time / info['loop_time_s']:.1%} of the loop)")
+    return population, logbook, info
+
+
+def _generation_row(gen, nevals, record, timings, start):
+    row = dict(timings) if timings else {"gen": gen, "nevals": nevals}
+    row.update((key, float(value)) for key, value in record.items())
+    row["elapsed_s"] = time.perf_counter() - start
+    return row
+
+
+def _improvements(gens, best_values):
+    """(generation, best-so-far) pairs at every generation where the best improved."""
+    improvements = []
+    for gen, value in zip(gens, best_values):
+        if not improvements or value < improvements[-1][1]:
+            improvements.append((gen, value))
+    return improvements
+
+
+def convergence_generation(logbook, rel_tol=1e-6):
+    """First generation whose best-so-far is within rel_tol of the final best."""
+    best_so_far = np.minimum.accumulate(logbook.select("min"))
+    return int(np.argmax(best_so_far <= best_so_far[-1] + rel_tol * abs(best_so_far[-1])))
+
+
+def run_ga(r_initial, r_target, pop_size=50, ngen=40, cxpb=0.7, mutpb=0.2,
+           rb_bounds=(1.01, 500.0), sigma=10.0, seed=None, verbose=False,
+           stall_generations=None, rel_tol=1e-6, time_budget=None,
+           checkpoint_path=None, checkpoint_every=10, profile_path=None, writer=None, tags=None):
+    """
+    Run the GA for one scenario and return a flat dict of results
+    (best solution, Hohmann comparison, evaluation count, wall time).
+    With no stopping rule, checkpoint or profile set, the loop is identical to
+    eaSimple (same operators in the same RNG order).
+
+    With a `writer` (results_store.ColumnStore), the per-generation stats are
+    streamed to its "generations" table instead of being kept in a Logbook, and the
+    result dict is appended to its "runs" table; `tags` (e.g. scenario name, seed)
+    are added to every row.
+    """
+    if writer is not None:
+        writer = writer.tagged(**(tags or {}))
+    if seed is not None:
+        random.seed(seed)
+        np.random.seed(seed)
+    problem = BiellipticProblem(r_initial, r_target)
+    toolbox = make_toolbox(problem, rb_bounds, sigma)
+    pop = toolbox.population(n=pop_size)
+    hof = tools.HallOfFame(1)
+
+    start = time.perf_counter()
+    profiler = GenerationProfiler(profile_path) if profile_path is not None else None
+    try:
+        _, _, info = ea_early_stopping(pop, toolbox, cxpb, mutpb, ngen, make_stats(), hof,
+                                       stall_generations, rel_tol, time_budget, verbose,
+                                       checkpoint_path, checkpoint_every, profiler, writer,
+                                       keep_logbook=writer is None)
+    finally:
+        if profiler is not None:
+            profiler.close()
+    wall_time = time.perf_counter() - start
+
+    result = {
+        "r_initial_km": problem.r_initial,
+        "r_target_km": problem.r_target,
+        "seed": seed,
+        "generations": info["generations_run"],
+        "convergence_generation": info["convergence_generation"],
+        "evaluations": info["evaluations"],
+        "evaluations_saved": info["evaluations_saved"],
+        "stop_reason": info["stop_reason"],
+        "wall_time_s": wall_time,
+        "checkpoint_time_s": info["checkpoint_time_s"],
+    }
+    result.update(problem.summary(hof[0][0]))
+    if writer is not None:
+        writer.append("runs", result)
+    return result
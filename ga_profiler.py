@@ -0,0 +1,75 @@
+# ga_profiler.py
+# Per-generation instrumentation for the GA loop (ga_engine.ea_early_stopping):
+# wall time of every phase (selection, clone, cxBlend, mutGaussian, evaluation,
+# HallOfFame update, statistics) and the evaluation count, streamed as one JSON
+# line per generation next to the Logbook so regressions are visible right away.
+
+from contextlib import contextmanager
+import json
+import time
+
+PHASES = ("select", "clone", "mate", "mutate", "evaluate", "halloffame", "stats")
+
+
+class GenerationProfiler:
+    def __init__(self, path=None, keep=False):
+        """
+        path: JSON-lines file the per-generation records are appended to (None: no file).
+        keep: also keep the records in self.records (for short runs / notebooks).
+        """
+        self.path = path
+        self.keep = keep
+        self.records = []
+        self._file = open(path, 'a') if path is not None else None
+        self._timings = dict.fromkeys(PHASES, 0.0)
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._timings[name] += time.perf_counter() - t0
+
+    def end_generation(self, gen, nevals, record=None):
+        """Emit the timings accumulated since the previous call, plus the logbook record."""
+        now = time.perf_counter()
+        line = {"gen": gen, "nevals": nevals}
+        line.update((f"{name}_s", t) for name, t in self._timings.items())
+        line["total_s"] = now - self._start
+        if record:
+            line.update((key, float(value)) for key, value in record.items())
+        if self._file is not None:
+            self._file.write(json.dumps(line) + "\n")
+            self._file.flush()
+        if self.keep:
+            self.records.append(line)
+        self._timings = dict.fromkeys(PHASES, 0.0)
+        self._start = now
+        return line
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class _NullProfiler:
+    """Stand-in used when profiling is off: phases cost one attribute lookup."""
+
+    @contextmanager
+    def phase(self, name):
+        yield
+
+    def end_generation(self, gen, nevals, record=None):
+        pass
+
+
+NULL_PROFILER = _NullProfiler()
+
+
+def load_profile(path):
+    """Read a JSON-lines profile back as a list of dicts."""
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
@@ -0,0 +1,137 @@
+# island_model.py
+# Island-model GA: several DEAP populations evolve in separate processes and every
+# `migration_interval` generations each island sends its best individuals to the
+# next island of a ring (multiprocessing queues, genes + fitness only), replacing
+# that island's worst ones. Islands only synchronise at migrations, so throughput
+# scales with the number of cores.
+#
+#   python island_model.py --preset GEO --islands 8 --ngen 40
+#   python island_model.py --preset FAR_ORBIT --scaling      # 1, 2, 4, ... islands
+
+import argparse
+import multiprocessing as mp
+import os
+import random
+import time
+
+import numpy as np
+from deap import creator, tools
+
+from ga_engine import BiellipticProblem, R_EARTH, make_toolbox, vary
+from scenario_sweep import PRESETS
+
+
+def _evaluate_invalid(population, toolbox):
+    invalid_ind = [ind for ind in population if not ind.fitness.valid]
+    for ind, fit in zip(invalid_ind, toolbox.map(toolbox.evaluate, invalid_ind)):
+        ind.fitness.values = fit
+    return len(invalid_ind)
+
+
+def _island(index, inbox, outbox, results, r_initial, r_target, settings):
+    """Body of one island process."""
+    random.seed(settings["seed"] + index)
+    np.random.seed(settings["seed"] + index)
+    problem = BiellipticProblem(r_initial, r_target)
+    toolbox = make_toolbox(problem, settings["rb_bounds"], settings["sigma"])
+    pop = toolbox.population(n=settings["pop_size"])
+    hof = tools.HallOfFame(1)
+    nevals = _evaluate_invalid(pop, toolbox)
+    hof.update(pop)
+    best_per_gen = [hof[0].fitness.values[0]]
+
+    for gen in range(1, settings["ngen"] + 1):
+        offspring = toolbox.select(pop, len(pop))
+        offspring = vary(offspring, toolbox, settings["cxpb"], settings["mutpb"])
+        nevals += _evaluate_invalid(offspring, toolbox)
+        hof.update(offspring)
+        pop[:] = offspring
+
+        if outbox is not None and gen % settings["migration_interval"] == 0:
+            emigrants = tools.selBest(pop, settings["n_migrants"])
+            outbox.put([(list(ind), ind.fitness.values) for ind in emigrants])
+            immigrants = inbox.get()
+            worst = sorted(range(len(pop)), key=lambda i: pop[i].fitness)[:len(immigrants)]
+            for i, (genes, fitness) in zip(worst, immigrants):
+                ind = creator.Individual(genes)
+                ind.fitness.values = fitness
+                pop[i] = ind
+            hof.update(pop)
+        best_per_gen.append(hof[0].fitness.values[0])
+
+    results.put({"island": index, "best": list(hof[0]), "fitness": hof[0].fitness.values[0],
+                 "evaluations": nevals, "best_per_gen": best_per_gen})
+
+
+def run_islands(r_initial, r_target, n_islands=None, pop_size=50, ngen=40, migration_interval=5,
+                n_migrants=2, cxpb=0.7, mutpb=0.2, rb_bounds=(1.01, 500.0), sigma=10.0, seed=0):
+    """Run the island model and return the overall best, per-island results and throughput."""
+    n_islands = n_islands or os.cpu_count()
+    settings = dict(pop_size=pop_size, ngen=ngen, migration_interval=migration_interval,
+                    n_migrants=n_migrants, cxpb=cxpb, mutpb=mutpb, rb_bounds=rb_bounds,
+                    sigma=sigma, seed=seed)
+    ctx = mp.get_context()
+    queues = [ctx.Queue() for _ in range(n_islands)]
+    results = ctx.Queue()
+    procs = []
+    for i in range(n_islands):
+        # Ring topology: island i receives on queues[i] and sends to island i + 1
+        outbox = queues[(i + 1) % n_islands] if n_islands > 1 else None
+        procs.append(ctx.Process(target=_island, args=(i, queues[i], outbox, results,
+                                                       r_initial, r_target, settings)))
+    start = time.perf_counter()
+    for p in procs:
+        p.start()
+    islands = sorted((results.get() for _ in procs), key=lambda r: r["island"])
+    for p in procs:
+        p.join()
+    wall_time = time.perf_counter() - start
+
+    best = min(islands, key=lambda r: r["fitness"])
+    evaluations = sum(r["evaluations"] for r in islands)
+    summary = BiellipticProblem(r_initial, r_target).summary(best["best"][0])
+    summary.update({
+        "islands": n_islands,
+        "evaluations": evaluations,
+        "wall_time_s": wall_time,
+        "evals_per_s": evaluations / wall_time,
+    })
+    return summary, islands
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Island-model GA across processes.")
+    parser.add_argument('--preset', default='GEO', choices=sorted(PRESETS))
+    parser.add_argument('--islands', type=int, default=None, help="Number of islands (default: all cores).")
+    parser.add_argument('--pop', type=int, default=50, help="Population per island.")
+    parser.add_argument('--ngen', type=int, default=40)
+    parser.add_argument('--interval', type=int, default=5, help="Generations between migrations.")
+    parser.add_argument('--migrants', type=int, default=2)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--scaling', action='store_true',
+                        help="Measure throughput for 1, 2, 4, ... up to --islands islands.")
+    args = parser.parse_args()
+
+    altitude, r_target = PRESETS[args.preset]
+    r_initial = R_EARTH + altitude
+    max_islands = args.islands or os.cpu_count()
+    counts = [max_islands]
+    if args.scaling:
+        counts = sorted({2**i for i in range(max_islands.bit_length()) if 2**i <= max_islands} | {max_islands})
+
+    print(f"--- Island model: {args.preset} ---")
+    base_rate = None
+    for n in counts:
+        summary, _ = run_islands(r_initial, r_target, n, args.pop, args.ngen, args.interval,
+                                 args.migrants, seed=args.seed)
+        if n == 1:
+            base_rate = summary["evals_per_s"]
+        # Speed-up only against a measured 1-island run (--scaling)
+        speedup = f" (speed-up {summary['evals_per_s'] / base_rate:.1f}x)" if base_rate else ""
+        print(f"{n:3d} islands: best Delta-V {summary['dv_total']:.2f} m/s (rb_ratio {summary['rb_ratio']:.4f}), "
+              f"{summary['evaluations']} evaluations in {summary['wall_time_s']:.2f} s, "
+              f"{summary['evals_per_s']:.0f} evals/s{speedup}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+# multi_fidelity.py
+# Multi-fidelity helpers for StationKeepingEnv (project_drl.py). The physics backend
+# is chosen per env: 'poliastro' (Orbit.circular / apply_maneuver / Orbit.propagate)
+# is the truth, 'analytic' (closed form, station_keeping_kernels.py) is the cheap
+# surrogate for bulk training. Both work with the constant or the tabulated drag decay
+# (decay_model='drag', atmosphere.py).
+#
+# run_episode() plays a policy on one backend and can mirror every action on a second
+# "shadow" env: the altitude difference between the two is the surrogate-vs-truth
+# drift under that policy's own action distribution. Every env counts its steps and
+# step() time (env.throughput()), so steps/sec are reported per backend.
+# train_ppo.py --curriculum uses validate() to check a policy trained on the surrogate
+# against the truth backend.
+#
+#   python multi_fidelity.py --episodes 3                   # random policy
+#   python multi_fidelity.py --model ppo_station_keeping --decay-model drag --record results/rollouts
+
+import argparse
+
+import numpy as np
+
+from project_drl import StationKeepingEnv
+from rollout_store import TrajectoryRecorder
+
+BACKENDS = ('poliastro', 'analytic')
+
+
+def random_policy(thrust_prob=0.3, seed=0):
+    rng = np.random.default_rng(seed)
+    return lambda obs: int(rng.random() < thrust_prob)
+
+
+def model_policy(model):
+    """Deterministic policy of a trained stable-baselines3 model."""
+    return lambda obs: int(model.predict(obs, deterministic=True)[0])
+
+
+def run_episode(policy, env, shadow=None, seed=None, max_steps=None, recorder=None, episode=0, options=None):
+    """
+    One episode of `policy` (obs -> action) on `env`, at most `max_steps` steps, from the
+    initial conditions of reset `options` (e.g. {"altitude": 398.0}). With
+    `shadow` (an env on another backend), the same actions are replayed on it and the
+    drift of its altitude with respect to `env` is measured. With `recorder` (a
+    rollout_store.TrajectoryRecorder), every step is recorded under `episode`.
+    """
+    obs, _ = env.reset(seed=seed, options=options)
+    if shadow is not None:
+        shadow.reset(seed=seed, options=options)
+    band = env.allowed_band.to_value(env.allowed_band.unit)
+    target = env.target_altitude.to_value(env.target_altitude.unit)
+    result = {"steps": 0, "reward": 0.0, "in_band_steps": 0, "thrusts": 0, "terminated": False}
+    drift = []
+    terminated = truncated = False
+    while not (terminated or truncated) and (max_steps is None or result["steps"] < max_steps):
+        action = policy(obs)
+        obs, reward, terminated, truncated, _ = env.step(action)
+        result["steps"] += 1
+        result["reward"] += reward
+        result["thrusts"] += action == 1
+        result["in_band_steps"] += abs(env.altitude_km - target) <= band
+        if recorder is not None:
+            recorder.record(episode, env.current_step, env.altitude_km, reward, action)
+        if shadow is not None:
+            shadow.step(action)
+            drift.append(shadow.altitude_km - env.altitude_km)
+    result["terminated"] = bool(terminated)
+    result["time_in_band"] = result["in_band_steps"] / max(result["steps"], 1)
+    if shadow is not None:
+        drift = np.abs(drift) if drift else np.zeros(1)
+        result.update(max_drift_km=float(drift.max()), final_drift_km=float(drift[-1]))
+    return result
+
+
+def validate(policy, physics='poliastro', shadow_physics=None, episodes=1, seed=0, max_steps=None,
+             recorder=None, **env_kwargs):
+    """
+    Mean episode statistics of `policy` on the `physics` backend over `episodes` seeds,
+    plus the drift of `shadow_physics` (the training surrogate) and steps/sec per backend.
+    """
+    env = StationKeepingEnv(physics=physics, **env_kwargs)
+    shadow = StationKeepingEnv(physics=shadow_physics, **env_kwargs) if shadow_physics else None
+    runs = [run_episode(policy, env, shadow, seed + i, max_steps, recorder, episode=seed + i)
+            for i in range(episodes)]
+    summary = {key: float(np.mean([r[key] for r in runs])) for key in runs[0]}
+    summary["failures"] = sum(r["terminated"] for r in runs)
+    summary[f"{physics}_steps_per_s"] = env.throughput()["steps_per_s"]
+    if shadow is not None:
+        summary["max_drift_km"] = max(r["max_drift_km"] for r in runs)
+        summary[f"{shadow_physics}_steps_per_s"] = shadow.throughput()["steps_per_s"]
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Surrogate-vs-truth drift and steps/sec of the physics backends.")
+    parser.add_argument('--episodes', type=int, default=3)
+    parser.add_argument('--max-steps', type=int, default=None, help="Cut episodes after this many steps.")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--model', default=None, help="Saved PPO model (default: random policy).")
+    parser.add_argument('--thrust-prob', type=float, default=0.3, help="Thrust probability of the random policy.")
+    parser.add_argument('--decay-model', default='constant', choices=['constant', 'drag'])
+    parser.add_argument('--f107', type=float, default=150.0)
+    parser.add_argument('--record', default=None,
+                        help="Spill the truth-backend trajectories to this directory (see rollout_store.py).")
+    args = parser.parse_args()
+
+    if args.model:
+        from stable_baselines3 import PPO
+        policy = model_policy(PPO.load(args.model, device='cpu'))
+    else:
+        policy = random_policy(args.thrust_prob, args.seed)
+    env_kwargs = {"decay_model": args.decay_model, "f107": args.f107}
+    print(f"--- Physics backends: {args.episodes} episodes, {args.decay_model} decay, "
+          f"{'model ' + args.model if args.model else 'random policy'} ---")
+    recorder = TrajectoryRecorder(args.record) if args.record else None
+    try:
+        summary = validate(policy, 'poliastro', 'analytic', args.episodes, args.seed, args.max_steps, recorder,
+                           **env_kwargs)
+    except ImportError as e:
+        print(f"poliastro backend unavailable ({e}): no truth to measure the drift against.")
+        summary = validate(policy, 'analytic', None, args.episodes, args.seed, args.max_steps, recorder,
+                           **env_kwargs)
+    finally:
+        if recorder is not None:
+            recorder.close()
+    for backend in BACKENDS:
+        if f"{backend}_steps_per_s" in summary:
+            print(f"{backend:10s}: {summary[f'{backend}_steps_per_s']:,.0f} steps/s")
+    if "max_drift_km" in summary:
+        print(f"analytic vs poliastro drift: max {summary['max_drift_km']:.3e} km, "
+              f"final {summary['final_drift_km']:.3e} km (mean over episodes)")
+    print(f"episode: {summary['steps']:.0f} steps, reward {summary['reward']:.1f}, "
+          f"time in band {summary['time_in_band']:.1%}, {summary['thrusts']:.0f} thrusts, "
+          f"{summary['failures']} failures")
+    if args.record:
+        print(f"-> Trajectories saved to: {args.record}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# n_impulse.py
+# Generalized coplanar N-impulse transfer optimizer on the same DEAP toolbox as the
+# bi-elliptic GA. An individual holds the N - 2 intermediate apsides as ratios to
+# r_target (N = 3 is the bi-elliptic rb_ratio problem). The whole population is
+# evaluated in one vectorized call, and infeasible transfers are handled with a
+# constraint mask instead of the 9999999-on-exception path.
+#
+#   python n_impulse.py --preset FAR_ORBIT --impulses 4 --pop 20000 --ngen 40
+
+import argparse
+import random
+import time
+
+import numpy as np
+from deap import tools
+
+from ga_engine import K_EARTH, PENALTY, R_EARTH, ea_early_stopping, make_stats, make_toolbox
+from scenario_sweep import PRESETS
+from transfer_kernels import batched_map, hohmann_cost, n_impulse_cost
+
+
+class NImpulseProblem:
+    """
+    N-impulse transfer between circular orbits (radii in km). Genes are the
+    intermediate apsides divided by r_target; an individual is feasible when every
+    apsis stays above `r_min` (default: 100 km altitude) and at most `max_ratio`.
+    Subclasses (plane_change.PlaneChangeProblem) add genes by overriding cost() and
+    summary(); evaluation, counting and the penalty stay here.
+    """
+
+    min_impulses = 3  # 2 is the Hohmann transfer, which has no apsis to optimize
+
+    def __init__(self, r_initial, r_target, n_impulses=4, r_min=R_EARTH + 100.0, max_ratio=1000.0,
+                 k=K_EARTH):
+        if n_impulses < self.min_impulses:
+            raise ValueError(f"n_impulses must be at least {self.min_impulses}.")
+        self.r_initial = float(r_initial)
+        self.r_target = float(r_target)
+        self.n_impulses = n_impulses
+        self.n_apsides = n_impulses - 2
+        self.n_genes = self.n_apsides
+        self.r_min = r_min
+        self.max_ratio = max_ratio
+        self.k = k
+        self.evaluations = 0
+
+    def cost(self, genes):
+        """Impulses (km/s, shape (P, N)), flight time (s) and feasibility mask for a (P, N-2) array."""
+        genes = np.asarray(genes, dtype=float).reshape(-1, self.n_genes)
+        apsides = genes * self.r_target
+        feasible = np.all((apsides >= self.r_min) & (genes <= self.max_ratio), axis=1)
+        # Infeasible rows are evaluated on a dummy (valid) transfer, then masked out
+        safe = np.where(feasible[:, None], apsides, self.r_target)
+        impulses, tof = n_impulse_cost(self.k, self.r_initial, safe, self.r_target)
+        feasible &= np.isfinite(tof)
+        return impulses, tof, feasible
+
+    def evaluate_array(self, genes):
+        """Fitness (m/s) of a (P, n_genes) gene array, as a float array (see array_ga.py)."""
+        impulses, _, feasible = self.cost(genes)
+        self.evaluations += len(feasible)
+        return np.where(feasible, impulses.sum(axis=1) * 1000.0, PENALTY)
+
+    def evaluate_population(self, individuals):
+        return [(f,) for f in self.evaluate_array(np.asarray(individuals, dtype=float)).tolist()]
+
+    def evaluate(self, individual):
+        return self.evaluate_population([individual])[0]
+
+    def map(self, func, individuals):
+        return batched_map(self.evaluate, self.evaluate_population)(func, individuals)
+
+    def summary(self, genes):
+        impulses, tof, _ = self.cost([genes])
+        hohmann_dv, hohmann_tof = hohmann_cost(self.k, self.r_initial, self.r_target)
+        result = {"n_impulses": self.n_impulses}
+        result.update((f"apsis_ratio_{i + 1}", float(g)) for i, g in enumerate(genes))
+        result.update((f"dv_impulse_{i + 1}", float(dv) * 1000.0) for i, dv in enumerate(impulses[0]))
+        result.update({
+            "dv_total": float(impulses[0].sum()) * 1000.0,
+            "tof_days": float(tof[0]) / 86400.0,
+            "hohmann_dv": float(hohmann_dv) * 1000.0,
+            "hohmann_tof_days": float(hohmann_tof) / 86400.0,
+            "savings_vs_hohmann": (float(hohmann_dv) - float(impulses[0].sum())) * 1000.0,
+        })
+        return result
+
+
+def run_n_impulse(r_initial, r_target, n_impulses=4, pop_size=20000, ngen=40, cxpb=0.7, mutpb=0.2,
+                  ratio_bounds=(0.05, 500.0), sigma=10.0, seed=None, stall_generations=None,
+                  verbose=False):
+    if seed is not None:
+        random.seed(seed)
+        np.random.seed(seed)
+    problem = NImpulseProblem(r_initial, r_target, n_impulses)
+    toolbox = make_toolbox(problem, ratio_bounds, sigma, n_genes=problem.n_genes)
+    pop = toolbox.population(n=pop_size)
+    hof = tools.HallOfFame(1)
+    start = time.perf_counter()
+    _, _, info = ea_early_stopping(pop, toolbox, cxpb, mutpb, ngen, make_stats(), hof,
+                                   stall_generations=stall_generations, verbose=verbose)
+    result = problem.summary(list(hof[0]))
+    result.update({"evaluations": problem.evaluations, "generations": info["generations_run"],
+                   "wall_time_s": time.perf_counter() - start})
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GA for coplanar N-impulse transfers.")
+    parser.add_argument('--preset', default='FAR_ORBIT', choices=sorted(PRESETS))
+    parser.add_argument('--impulses', type=int, nargs='+', default=[3, 4, 5])
+    parser.add_argument('--pop', type=int, default=20000)
+    parser.add_argument('--ngen', type=int, default=40)
+    parser.add_argument('--stall', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    altitude, r_target = PRESETS[args.preset]
+    print(f"--- N-impulse transfers: {args.preset}, population {args.pop} ---")
+    for n in args.impulses:
+        result = run_n_impulse(R_EARTH + altitude, r_target, n, args.pop, args.ngen, seed=args.seed,
+                               stall_generations=args.stall)
+        apsides = ", ".join(f"{result[f'apsis_ratio_{i + 1}']:.4f}" for i in range(n - 2))
+        print(f"{n} impulses: total Delta-V {result['dv_total']:.2f} m/s "
+              f"(Hohmann {result['hohmann_dv']:.2f}), flight time {result['tof_days']:.2f} d, "
+              f"apsides / r_target = [{apsides}], {result['evaluations']} evaluations "
+              f"in {result['wall_time_s']:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# plane_change.py
+# Combined plane-change transfer optimization. The GEO scenario of
+# project_ga_final_for_paper_english.py is coplanar; real LEO -> GEO transfers also
+# remove the launch-site inclination (28.5 deg from Cape Canaveral by default). Here
+# the GA chooses the intermediate apsides (bi-elliptic: rb_ratio) AND how the
+# inclination change is split between the burns; the cost model is vectorized over
+# the whole population (transfer_kernels.plane_change_cost).
+#
+#   python plane_change.py --delta-i 28.5 --impulses 2 3
+
+import argparse
+import random
+import time
+
+import numpy as np
+from deap import tools
+
+from ga_engine import K_EARTH, R_EARTH, ea_early_stopping, make_stats, make_toolbox
+from n_impulse import NImpulseProblem
+from scenario_sweep import PRESETS
+from transfer_kernels import plane_change_cost
+
+
+class PlaneChangeProblem(NImpulseProblem):
+    """
+    N-impulse transfer (N = 2: Hohmann, N = 3: bi-elliptic, ...) with an inclination
+    change `delta_i_deg`. Genes: the N - 2 apsis ratios (apsis / r_target), then the
+    fractions of delta_i done at the first N - 1 burns; the last burn does the rest.
+    Infeasible individuals (negative fractions, fractions adding up to more than 1,
+    apsides below `r_min`) are masked with the penalty.
+    """
+
+    min_impulses = 2
+
+    def __init__(self, r_initial, r_target, delta_i_deg, n_impulses=3, r_min=R_EARTH + 100.0,
+                 max_ratio=1000.0, k=K_EARTH):
+        super().__init__(r_initial, r_target, n_impulses, r_min, max_ratio, k)
+        self.delta_i = np.radians(delta_i_deg)
+        self.n_genes = self.n_apsides + n_impulses - 1
+
+    def split(self, genes):
+        """(P, n_genes) genes -> apsides (km, (P, N-2)), delta_i per burn (rad, (P, N)), mask."""
+        genes = np.asarray(genes, dtype=float).reshape(-1, self.n_genes)
+        ratios, fractions = genes[:, :self.n_apsides], genes[:, self.n_apsides:]
+        fractions = np.concatenate([fractions, 1.0 - fractions.sum(axis=1, keepdims=True)], axis=1)
+        apsides = ratios * self.r_target
+        feasible = (np.all(fractions >= 0.0, axis=1)
+                    & np.all((apsides >= self.r_min) & (ratios <= self.max_ratio), axis=1))
+        apsides = np.where(feasible[:, None], apsides, self.r_target)
+        return apsides, fractions * self.delta_i, feasible
+
+    def cost(self, genes):
+        apsides, delta_i, feasible = self.split(genes)
+        impulses, tof = plane_change_cost(self.k, self.r_initial, apsides, self.r_target, delta_i)
+        return impulses, tof, feasible & np.isfinite(tof)
+
+    def gene_bounds(self, ratio_bounds=(1.01, 20.0)):
+        return [ratio_bounds] * self.n_apsides + [(0.0, 1.0 / (self.n_impulses - 1))] * (self.n_impulses - 1)
+
+    def hohmann_reference(self):
+        """Textbook baseline: Hohmann transfer with all of delta_i at the apogee burn (km/s, s)."""
+        impulses, tof = plane_change_cost(self.k, self.r_initial, np.empty((1, 0)), self.r_target,
+                                          np.array([[0.0, self.delta_i]]))
+        return float(impulses.sum()), float(tof[0])
+
+    def summary(self, genes):
+        impulses, tof, _ = self.cost([genes])
+        _, delta_i, _ = self.split([genes])
+        result = {"n_impulses": self.n_impulses, "delta_i_deg": float(np.degrees(self.delta_i))}
+        result.update((f"apsis_ratio_{i + 1}", float(g)) for i, g in enumerate(genes[:self.n_apsides]))
+        result.update((f"delta_i_{i + 1}_deg", float(np.degrees(d))) for i, d in enumerate(delta_i[0]))
+        result.update((f"dv_impulse_{i + 1}", float(dv) * 1000.0) for i, dv in enumerate(impulses[0]))
+        hohmann_dv, hohmann_tof = self.hohmann_reference()
+        result.update({
+            "dv_total": float(impulses[0].sum()) * 1000.0,
+            "tof_days": float(tof[0]) / 86400.0,
+            "hohmann_dv": hohmann_dv * 1000.0,
+            "hohmann_tof_days": hohmann_tof / 86400.0,
+            "savings_vs_hohmann": (hohmann_dv - float(impulses[0].sum())) * 1000.0,
+        })
+        return result
+
+
+def run_plane_change(r_initial, r_target, delta_i_deg=28.5, n_impulses=3, pop_size=2000, ngen=60,
+                     cxpb=0.7, mutpb=0.2, seed=None, stall_generations=None, verbose=False):
+    if seed is not None:
+        random.seed(seed)
+        np.random.seed(seed)
+    problem = PlaneChangeProblem(r_initial, r_target, delta_i_deg, n_impulses)
+    # Plane changes are cheapest at apogees of a few r_target, so the radius ratios start
+    # in (1.01, 20) with a finer mutation than rb_ratio; fractions mutate on a 0-1 scale
+    sigma = [1.0] * problem.n_apsides + [0.05] * (n_impulses - 1)
+    toolbox = make_toolbox(problem, sigma=sigma, gene_bounds=problem.gene_bounds())
+    pop = toolbox.population(n=pop_size)
+    hof = tools.HallOfFame(1)
+    start = time.perf_counter()
+    _, _, info = ea_early_stopping(pop, toolbox, cxpb, mutpb, ngen, make_stats(), hof,
+                                   stall_generations=stall_generations, verbose=verbose)
+    result = problem.summary(list(hof[0]))
+    result.update({"evaluations": problem.evaluations, "generations": info["generations_run"],
+                   "wall_time_s": time.perf_counter() - start})
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GA for LEO -> GEO transfers with a split plane change.")
+    parser.add_argument('--preset', default='GEO', choices=sorted(PRESETS))
+    parser.add_argument('--delta-i', type=float, default=28.5, help="Inclination change (deg).")
+    parser.add_argument('--impulses', type=int, nargs='+', default=[2, 3])
+    parser.add_argument('--pop', type=int, default=2000)
+    parser.add_argument('--ngen', type=int, default=60)
+    parser.add_argument('--stall', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    # Default: the GEO scenario of the English paper script (scenario_sweep.PRESETS)
+    altitude, r_target = PRESETS[args.preset]
+    r_initial = R_EARTH + altitude
+    print(f"--- {args.preset} scenario with a {args.delta_i:.1f} deg plane change ---")
+    for n in args.impulses:
+        result = run_plane_change(r_initial, r_target, args.delta_i, n, args.pop, args.ngen,
+                                  seed=args.seed, stall_generations=args.stall)
+        split = ", ".join(f"{result[f'delta_i_{i + 1}_deg']:.2f}" for i in range(n))
+        print(f"\n{n} impulses: total Delta-V {result['dv_total']:.2f} m/s, flight time {result['tof_days']:.2f} d")
+        print(f"  - Inclination change per burn (deg): [{split}]")
+        for i in range(n - 2):
+            print(f"  - Apsis {i + 1} / r_target: {result[f'apsis_ratio_{i + 1}']:.4f}")
+        print(f"  - Hohmann with the plane change at apogee: {result['hohmann_dv']:.2f} m/s "
+              f"(savings {result['savings_vs_hohmann']:.2f} m/s)")
+        print(f"  - {result['evaluations']} evaluations in {result['wall_time_s']:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
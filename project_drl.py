@@ -4,20 +4,50 @@ import gymnasium as gym
 from gymnasium import spaces
 import numpy as np
 import astropy.units as u
-
-from poliastro.bodies import Earth
-from poliastro.twobody import Orbit
-from poliastro.maneuver import Maneuver
 import os
+import time
+from functools import lru_cache
+
+from atmosphere import get_decay_table
+from station_keeping_kernels import K_EARTH, R_EARTH, perigee_after_impulse_scalar, step_anomaly_scalar
+
+
+# poliastro chỉ được import khi cần (physics='poliastro' hoặc khi đọc current_orbit),
+# nên các worker chạy chế độ analytic khởi động nhanh hơn
+@lru_cache(maxsize=None)
+def _poliastro():
+    from poliastro.bodies import Earth
+    from poliastro.twobody import Orbit
+    from poliastro.maneuver import Maneuver
+    return Earth, Orbit, Maneuver
 
 # --- Thiết kế Môi trường Station Keeping ---
 class StationKeepingEnv(gym.Env):
-    def __init__(self):
+    def __init__(self, physics='poliastro', decay_model='constant', ballistic_coefficient=50.0, f107=150.0):
+        """
+        physics: 'poliastro' (Orbit.circular + apply_maneuver + Orbit.propagate, như cũ)
+        hoặc 'analytic' (công thức đóng cho quỹ đạo tròn, chỉ dùng float, xem
+        station_keeping_kernels.py; kết quả trùng với poliastro tới sai số làm tròn).
+        decay_model: 'constant' (giảm decay_per_step = 0.01 km mỗi bước, như cũ) hoặc
+        'drag' (lực cản khí quyển tra bảng theo độ cao, xem atmosphere.py), với
+        ballistic_coefficient = m / (Cd A) (kg/m^2) và thông lượng mặt trời f107 (sfu).
+
+        reset()/step() trả về một bản sao của buffer observation: các VecEnv của SB3 giữ
+        lại observation cuối của episode (terminal_observation) trước khi gọi reset().
+        """
         super(StationKeepingEnv, self).__init__()
+        if physics not in ('poliastro', 'analytic'):
+            raise ValueError("physics must be 'poliastro' or 'analytic'.")
+        if decay_model not in ('constant', 'drag'):
+            raise ValueError("decay_model must be 'constant' or 'drag'.")
+        self.physics = physics
+        self.decay_model = decay_model
+        self.ballistic_coefficient = float(ballistic_coefficient)  # kg/m^2
+        self.f107 = float(f107)  # sfu
 
         # --- Định nghĩa các tham số của môi trường ---
         self.target_altitude = 400 * u.km
-        self.target_radius = Earth.R + self.target_altitude
+        self.target_radius = R_EARTH * u.km + self.target_altitude
         self.allowed_band = 5 * u.km  # ± 5 km
         self.critical_altitude = 250 * u.km
         
@@ -35,55 +65,122 @@ class StationKeepingEnv(gym.Env):
         self.current_step = 0
         self.max_steps = int((30 * u.day) / self.time_step) # Mô phỏng 30 ngày
 
+        # Hằng số float (km, km/s, s), tính một lần thay vì .to_value() ở mỗi bước
+        # (float() vì to_value() trả về numpy.float64, chậm hơn float khi tính vô hướng)
+        self._target_radius_km = R_EARTH + float(self.target_altitude.to_value(u.km))
+        self._thrust_kms = float(self.thrust_magnitude.to_value(u.km / u.s))
+        self._time_step_s = float(self.time_step.to_value(u.s))
+        self._decay_km = float(self.decay_per_step.to_value(u.km))
+        self._band_km = float(self.allowed_band.to_value(u.km))
+        self._critical_km = float(self.critical_altitude.to_value(u.km))
+        self._impulse = None  # Maneuver.impulse [0, dv, 0], dựng một lần (chế độ poliastro)
+        # Bảng lực cản dùng chung cho mọi env của tiến trình; suy giảm (km) = giá trị bảng * _drag_scale
+        self._drag = get_decay_table(self.f107) if decay_model == 'drag' else None
+        self._drag_scale = self._time_step_s / (self.ballistic_coefficient * 1000.0)
+        self._observation = np.zeros(2, dtype=np.float32)  # buffer observation (trả về bản sao)
+        self.radius_km = None  # bán kính quỹ đạo hiện tại (km, float), gán khi reset()
+        self.anomaly = 0.0
+        # Bộ đếm thông lượng của backend (xem throughput())
+        self.total_steps = 0
+        self.step_time_s = 0.0
+
+    @property
+    def current_orbit(self):
+        # Chế độ analytic: chỉ dựng Orbit của poliastro khi có ai đọc nó (vd. vòng đánh giá)
+        if self._orbit is None and self.physics == 'analytic' and self.radius_km is not None:
+            Earth, Orbit, _ = _poliastro()
+            self._orbit = Orbit.circular(Earth, alt=(self.radius_km - R_EARTH) * u.km,
+                                         arglat=self.anomaly * u.rad)
+        return self._orbit
+
+    @current_orbit.setter
+    def current_orbit(self, orbit):
+        self._orbit = orbit
+
+    def decay_at(self, altitude_km):
+        """Độ cao mất đi (km) trong một bước, bắt đầu từ độ cao altitude_km."""
+        if self._drag is None:
+            return self._decay_km
+        return self._drag.rate(altitude_km) * self._drag_scale
+
+    @property
+    def altitude_km(self):
+        """Độ cao hiện tại (km, float), không cần đọc current_orbit.r_p qua Quantity."""
+        return self.radius_km - R_EARTH
+
     def reset(self, seed=None, options=None):
+        """options={"altitude": km}: bắt đầu từ một quỹ đạo tròn khác độ cao mục tiêu."""
         super().reset(seed=seed)
-        self.current_orbit = Orbit.circular(Earth, alt=self.target_altitude)
         self.current_step = 0
-        
-        altitude_error = 0.0
-        decay_rate = self.decay_per_step.to_value(u.km)
-        observation = np.array([altitude_error, decay_rate], dtype=np.float32)
+        altitude = options.get("altitude") if options else None
+        self.radius_km = self._target_radius_km if altitude is None else R_EARTH + float(altitude)
+        self.anomaly = 0.0
+        if self.physics == 'analytic':
+            self.current_orbit = None
+        else:
+            Earth, Orbit, Maneuver = _poliastro()
+            if self._impulse is None:
+                self._impulse = Maneuver.impulse([0, self.thrust_magnitude.to_value(u.m / u.s), 0] * u.m / u.s)
+            self.current_orbit = Orbit.circular(Earth, alt=self.target_altitude if altitude is None
+                                                else float(altitude) * u.km)
+
+        self._observation[0] = self.radius_km - self._target_radius_km  # altitude_error
+        self._observation[1] = self.decay_at(self.radius_km - R_EARTH)  # decay_rate
         info = {}
-        return observation, info
+        return self._observation.copy(), info
+
+    def throughput(self):
+        """Số bước đã chạy, thời gian nằm trong step() và số bước/giây của backend này."""
+        return {"physics": self.physics, "steps": self.total_steps, "step_time_s": self.step_time_s,
+                "steps_per_s": self.total_steps / self.step_time_s if self.step_time_s else None}
 
     def step(self, action):
+        t0 = time.perf_counter()
+        if self.physics == 'analytic':
+            result = self._step_analytic(action)
+        else:
+            result = self._step_poliastro(action)
+        self.step_time_s += time.perf_counter() - t0
+        self.total_steps += 1
+        return result
+
+    def _step_poliastro(self, action):
+        Earth, Orbit, _ = _poliastro()
         self.current_step += 1
         
         # --- 1. Áp dụng hành động của agent ---
         if action == 1:
-            dv_vector = [0, self.thrust_magnitude.to_value(u.m/u.s), 0] * u.m / u.s
-            maneuver = Maneuver.impulse(dv_vector)
-            self.current_orbit = self.current_orbit.apply_maneuver(maneuver)
+            self.current_orbit = self.current_orbit.apply_maneuver(self._impulse)
             fuel_penalty = -0.1 # Phạt vì dùng nhiên liệu
         else:
             fuel_penalty = 0.0
             
         # --- 2. Mô phỏng sự suy giảm quỹ đạo (Physics Step) ---
-        radius_before = self.current_orbit.r_p
-        new_altitude = (radius_before - Earth.R) - self.decay_per_step
-        if new_altitude < 0 * u.km:
-            new_altitude = 0 * u.km
-        self.current_orbit = Orbit.circular(Earth, alt=new_altitude)
+        # Tính bằng float (km); chỉ tạo một Quantity cho Orbit.circular
+        radius_before = float(self.current_orbit.r_p.to_value(u.km))
+        altitude_before = radius_before - R_EARTH
+        new_altitude = max(altitude_before - self.decay_at(altitude_before), 0.0)
+        self.current_orbit = Orbit.circular(Earth, alt=new_altitude * u.km)
         
         self.current_orbit = self.current_orbit.propagate(self.time_step)
         
         # --- 3. Tính toán trạng thái và phần thưởng (ĐÃ CẬP NHẬT) ---
-        current_radius = self.current_orbit.r_p
-        altitude_error = (current_radius - self.target_radius).to_value(u.km)
-        decay_rate = (radius_before - current_radius).to_value(u.km)
+        self.radius_km = float(self.current_orbit.r_p.to_value(u.km))
+        altitude_error = self.radius_km - self._target_radius_km
+        decay_rate = radius_before - self.radius_km
         
         # CẬP NHẬT LOGIC PHẦN THƯỞNG (REWARD SHAPING)
-        if abs(altitude_error) <= self.allowed_band.to_value(u.km):
+        if abs(altitude_error) <= self._band_km:
             reward = 1.0  # Thưởng vì ở trong vùng an toàn
         else:
             # Phạt tỷ lệ với bình phương sai số, khuyến khích agent ở gần vùng an toàn
-            reward = - (altitude_error / self.allowed_band.to_value(u.km))**2
+            reward = - (altitude_error / self._band_km)**2
 
         reward += fuel_penalty # Luôn áp dụng phạt nhiên liệu
 
         # --- 4. Kiểm tra điều kiện kết thúc ---
         terminated = False
-        if (current_radius - Earth.R) < self.critical_altitude:
+        if (self.radius_km - R_EARTH) < self._critical_km:
             reward = -100.0 # Phạt nặng khi thất bại
             terminated = True
         
@@ -91,14 +188,55 @@ class StationKeepingEnv(gym.Env):
         if self.current_step >= self.max_steps:
             truncated = True
         
-        observation = np.array([altitude_error, decay_rate], dtype=np.float32)
+        self._observation[0] = altitude_error
+        self._observation[1] = decay_rate
         info = {}
-        return observation, reward, terminated, truncated, info
+        return self._observation.copy(), reward, terminated, truncated, info
+
+    def _step_analytic(self, action):
+        """Giống hệt _step_poliastro() ở trên, nhưng bước vật lý dùng công thức đóng thay cho poliastro."""
+        self.current_step += 1
+        self.current_orbit = None
+
+        # --- 1 & 2. Cú đẩy [0, dv, 0] tại dị thường hiện tại, rồi suy giảm quỹ đạo ---
+        if action == 1:
+            radius_before = perigee_after_impulse_scalar(K_EARTH, self.radius_km, self.anomaly,
+                                                         self._thrust_kms)
+            fuel_penalty = -0.1
+        else:
+            radius_before = self.radius_km
+            fuel_penalty = 0.0
+        altitude_before = radius_before - R_EARTH
+        new_altitude = max(altitude_before - self.decay_at(altitude_before), 0.0)
+        self.radius_km = R_EARTH + new_altitude
+        # Truyền quỹ đạo tròn: chỉ dị thường thay đổi
+        self.anomaly = step_anomaly_scalar(K_EARTH, self.radius_km, self._time_step_s)
+
+        # --- 3. Trạng thái và phần thưởng (cùng công thức với step()) ---
+        altitude_error = self.radius_km - self._target_radius_km
+        decay_rate = radius_before - self.radius_km
+        if abs(altitude_error) <= self._band_km:
+            reward = 1.0
+        else:
+            reward = - (altitude_error / self._band_km)**2
+        reward += fuel_penalty
+
+        # --- 4. Điều kiện kết thúc ---
+        terminated = False
+        if new_altitude < self._critical_km:
+            reward = -100.0
+            terminated = True
+        truncated = self.current_step >= self.max_steps
+
+        self._observation[0] = altitude_error
+        self._observation[1] = decay_rate
+        return self._observation.copy(), reward, terminated, truncated, {}
 
 # --- Huấn luyện Agent ---
 if __name__ == "__main__":
     from stable_baselines3 import PPO
     import matplotlib.pyplot as plt
+    from rollout_store import TrajectoryRecorder
 
     # Tạo thư mục results nếu chưa có
     if not os.path.exists('results'):
@@ -118,9 +256,8 @@ if __name__ == "__main__":
     print("\nBắt đầu đánh giá agent đã huấn luyện...")
     obs, info = env.reset()
     
-    altitudes = []
-    rewards = []
-    actions = []
+    # Ghi quỹ đạo vào mảng NumPy cấp phát trước (xem rollout_store.py)
+    recorder = TrajectoryRecorder(capacity=env.max_steps)
     
     terminated = False
     truncated = False
@@ -129,17 +266,18 @@ if __name__ == "__main__":
         action, _states = model.predict(obs, deterministic=True)
         obs, reward, terminated, truncated, info = env.step(action)
         
-        altitudes.append(env.current_orbit.r_p.to_value(u.km) - Earth.R.to_value(u.km))
-        rewards.append(reward)
-        actions.append(action)
+        recorder.record(0, env.current_step, env.altitude_km, reward, action)
 
     print("Đánh giá hoàn tất.")
+    trajectory = recorder.columns()
+    altitudes = trajectory["altitude"]
+    actions = trajectory["action"]
     
     # --- Vẽ biểu đồ (METRICS FOR PAPER) ---
     fig, axs = plt.subplots(2, 1, figsize=(12, 8), sharex=True)
     
     # Biểu đồ độ cao
-    time_axis = np.arange(len(altitudes)) * env.time_step.to_value(u.min) / 60 # Chuyển sang giờ
+    time_axis = (trajectory["step"] - 1) * env.time_step.to_value(u.min) / 60 # Chuyển sang giờ
     axs[0].plot(time_axis, altitudes, label="Độ cao của vệ tinh")
     axs[0].axhline(y=env.target_altitude.to_value(u.km), color='r', linestyle='--', label="Độ cao mục tiêu")
     axs[0].axhline(y=env.target_altitude.to_value(u.km) + env.allowed_band.to_value(u.km), color='g', linestyle=':', label="Giới hạn trên")
@@ -1,15 +1,17 @@
 # project_ga_final_for_paper.py
-
-import astropy.units as u
-from poliastro.bodies import Earth
-from poliastro.twobody import Orbit
-from poliastro.maneuver import Maneuver
-from poliastro.plotting import OrbitPlotter3D
+# Import module này không có tác dụng phụ: astropy / poliastro chỉ được import khi
+# dựng kịch bản hoặc đánh giá, kịch bản chỉ được dựng trong main() hoặc trong
+# init_worker(), creator và toolbox của DEAP chỉ được tạo ở get_toolbox(), thư mục
+# results/ chỉ được tạo khi chạy main(), và bộ vẽ (poliastro.plotting / plotly) chỉ
+# được import khi cần vẽ biểu đồ. Xem startup_budget.py.
 
 import numpy as np
 import random
 from deap import base, creator, tools, algorithms
 import os # Dùng để tạo thư mục
+import multiprocessing
+from functools import lru_cache
+from ga_engine import ensure_creator
 
 # ===================================================================
 # --- CẤU HÌNH THÍ NGHIỆM (CHỈ CẦN THAY ĐỔI Ở ĐÂY) ---
@@ -17,29 +19,35 @@ import os # Dùng để tạo thư mục
 # Chọn kịch bản: 'GEO' hoặc 'FAR_ORBIT'
 SCENARIO = 'FAR_ORBIT'  # <-- THAY ĐỔI 'GEO' THÀNH 'FAR_ORBIT' ĐỂ CHẠY THÍ NGHIỆM 2
 
-# Tạo thư mục để lưu kết quả
-if not os.path.exists('results'):
-    os.makedirs('results')
+# Số tiến trình đánh giá song song: 0 hoặc 1 = chạy tuần tự như cũ,
+# N > 1 = dùng process pool N worker (có thể đặt qua biến môi trường GA_WORKERS)
+N_WORKERS = int(os.environ.get('GA_WORKERS', '0'))
 # ===================================================================
 
 
 # --- Thiết lập vấn đề ---
-print(f"--- Bắt đầu thí nghiệm cho kịch bản: {SCENARIO} ---")
-leo_orbit = Orbit.circular(Earth, alt=400 * u.km)
+def build_scenario(scenario):
+    """Tạo quỹ đạo ban đầu, bán kính đích và quỹ đạo đích cho một kịch bản."""
+    import astropy.units as u
+    from poliastro.bodies import Earth
+    from poliastro.twobody import Orbit
+    leo_orbit = Orbit.circular(Earth, alt=400 * u.km)
+
+    if scenario == 'GEO':
+        # Kịch bản 1: LEO -> GEO
+        r_target = Earth.R + 35786 * u.km
+    elif scenario == 'FAR_ORBIT':
+        # Kịch bản 2: LEO -> Quỹ đạo rất xa
+        r_target = 20 * leo_orbit.r_p
+    else:
+        raise ValueError("Kịch bản không hợp lệ. Vui lòng chọn 'GEO' hoặc 'FAR_ORBIT'.")
 
-if SCENARIO == 'GEO':
-    # Kịch bản 1: LEO -> GEO
-    r_target = Earth.R + 35786 * u.km
     target_orbit = Orbit.circular(Earth, r_target - Earth.R)
-elif SCENARIO == 'FAR_ORBIT':
-    # Kịch bản 2: LEO -> Quỹ đạo rất xa
-    r_target = 20 * leo_orbit.r_p
-    target_orbit = Orbit.circular(Earth, r_target - Earth.R)
-else:
-    raise ValueError("Kịch bản không hợp lệ. Vui lòng chọn 'GEO' hoặc 'FAR_ORBIT'.")
+    return leo_orbit, r_target, target_orbit
+
 
-print(f"Quỹ đạo ban đầu: LEO, bán kính {leo_orbit.r_p.to(u.km):.2f}")
-print(f"Quỹ đạo đích: bán kính {r_target.to(u.km):.2f}")
+# Được gán bởi init_worker() (trong main() hoặc trong mỗi worker của pool)
+leo_orbit = r_target = target_orbit = None
 
 
 # --- Hàm đánh giá (Fitness Function) ---
@@ -48,6 +56,8 @@ def evaluate_bielliptic(individual):
     Đánh giá chi phí của một cú chuyển Bi-elliptic.
     Cá thể chứa 1 gen: rb_ratio (tỷ lệ bán kính trung gian so với bán kính đích).
     """
+    import astropy.units as u
+    from poliastro.maneuver import Maneuver
     rb_ratio = individual[0]
 
     # Bán kính quỹ đạo trung gian phải lớn hơn bán kính đích
@@ -64,35 +74,83 @@ def evaluate_bielliptic(individual):
         return 9999999,
 
 
-# --- Thiết lập Thuật toán Di truyền (DEAP) ---
-creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
-creator.create("Individual", list, fitness=creator.FitnessMin)
+# --- Đánh giá song song (Process Pool) ---
+def init_worker(scenario):
+    """
+    Chạy một lần trong mỗi worker: tự dựng leo_orbit, r_target và các đối tượng
+    poliastro tại chỗ, để mỗi tác vụ chỉ cần gửi cá thể (một danh sách số thực)
+    thay vì pickle các Quantity của astropy.
+    """
+    global leo_orbit, r_target, target_orbit
+    leo_orbit, r_target, target_orbit = build_scenario(scenario)
 
-toolbox = base.Toolbox()
-# Gen duy nhất là rb_ratio, cho phép tìm kiếm trong một khoảng rộng
-toolbox.register("attr_rb_ratio", random.uniform, 1.01, 40.0)
-toolbox.register("individual", tools.initRepeat, creator.Individual, toolbox.attr_rb_ratio, n=1)
-toolbox.register("population", tools.initRepeat, list, toolbox.individual)
 
-# Các toán tử di truyền
-toolbox.register("evaluate", evaluate_bielliptic)
-toolbox.register("mate", tools.cxBlend, alpha=0.5)
-toolbox.register("mutate", tools.mutGaussian, mu=0, sigma=2.0, indpb=0.2)
-toolbox.register("select", tools.selTournament, tournsize=3)
+def make_pool_map(pool, n_workers):
+    """Thay thế toolbox.map: chia quần thể thành các khối (chunk) gửi cho worker."""
+    def pool_map(func, individuals):
+        individuals = list(individuals)
+        # Khoảng 4 khối cho mỗi worker để cân bằng tải mà không tốn nhiều chi phí IPC
+        chunksize = max(1, len(individuals) // (n_workers * 4))
+        return pool.map(func, individuals, chunksize=chunksize)
+    return pool_map
+
+
+# --- Thiết lập Thuật toán Di truyền (DEAP) ---
+@lru_cache(maxsize=None)
+def get_toolbox():
+    """Toolbox của DEAP, tạo một lần ở lần gọi đầu tiên (creator cũng vậy)."""
+    ensure_creator()  # creator.FitnessMin / creator.Individual, mỗi tiến trình một lần
+    toolbox = base.Toolbox()
+    # Gen duy nhất là rb_ratio, cho phép tìm kiếm trong một khoảng rộng
+    toolbox.register("attr_rb_ratio", random.uniform, 1.01, 40.0)
+    toolbox.register("individual", tools.initRepeat, creator.Individual, toolbox.attr_rb_ratio, n=1)
+    toolbox.register("population", tools.initRepeat, list, toolbox.individual)
+
+    # Các toán tử di truyền
+    toolbox.register("evaluate", evaluate_bielliptic)
+    toolbox.register("mate", tools.cxBlend, alpha=0.5)
+    toolbox.register("mutate", tools.mutGaussian, mu=0, sigma=2.0, indpb=0.2)
+    toolbox.register("select", tools.selTournament, tournsize=3)
+    return toolbox
 
 
 # --- Hàm chính để chạy và phân tích ---
 def main():
+    import astropy.units as u
+    from poliastro.maneuver import Maneuver
+
+    # Tạo thư mục để lưu kết quả
+    if not os.path.exists('results'):
+        os.makedirs('results')
+
+    print(f"--- Bắt đầu thí nghiệm cho kịch bản: {SCENARIO} ---")
+    init_worker(SCENARIO)
+    print(f"Quỹ đạo ban đầu: LEO, bán kính {leo_orbit.r_p.to(u.km):.2f}")
+    print(f"Quỹ đạo đích: bán kính {r_target.to(u.km):.2f}")
+
     # Chạy GA
+    toolbox = get_toolbox()
     pop = toolbox.population(n=40)
     hof = tools.HallOfFame(1)
     stats = tools.Statistics(lambda ind: ind.fitness.values)
     stats.register("avg", np.mean)
     stats.register("min", np.min)
 
+    pool = None
+    if N_WORKERS > 1:
+        print(f"Đánh giá song song với {N_WORKERS} tiến trình.")
+        pool = multiprocessing.Pool(N_WORKERS, initializer=init_worker, initargs=(SCENARIO,))
+        toolbox.register("map", make_pool_map(pool, N_WORKERS))
+
     print("\nBắt đầu quá trình tiến hóa của GA...")
-    algorithms.eaSimple(pop, toolbox, cxpb=0.7, mutpb=0.2, ngen=30,
-                        stats=stats, halloffame=hof, verbose=True)
+    try:
+        algorithms.eaSimple(pop, toolbox, cxpb=0.7, mutpb=0.2, ngen=30,
+                            stats=stats, halloffame=hof, verbose=True)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+            toolbox.register("map", map)
     print("Quá trình tiến hóa hoàn tất.")
 
     # --- Phân tích và in kết quả (METRICS FOR PAPER) ---
@@ -134,6 +192,7 @@ def main():
 
     # --- Lưu biểu đồ (FIGURES FOR PAPER) ---
     print("\nĐang tạo và lưu biểu đồ so sánh...")
+    from poliastro.plotting import OrbitPlotter3D
     # Lấy các quỹ đạo chuyển tiếp
     ga_transfer1, ga_transfer2, _ = leo_orbit.apply_maneuver(ga_maneuver, intermediate=True)
     hoh_transfer, _ = leo_orbit.apply_maneuver(hohmann_maneuver, intermediate=True)
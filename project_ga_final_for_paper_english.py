@@ -1,41 +1,72 @@
 # project_ga_final_for_paper_english.py (WITH DUAL PLOT FOR FAR_ORBIT)
-
-import astropy.units as u
-from poliastro.bodies import Earth
-from poliastro.twobody import Orbit
-from poliastro.maneuver import Maneuver
-from poliastro.plotting import OrbitPlotter3D
+# Importing this module has no side effects: the poliastro scenario, the DEAP toolbox,
+# the results/ folder and the plotting stack (poliastro.plotting, plotly) are built or
+# imported on first use only, so worker processes and headless evaluation-only runs
+# skip them. See startup_budget.py for the measured import + evaluation budget.
 
 import numpy as np
 import random
-from deap import base, creator, tools, algorithms
+from deap import base, creator, tools
 import os
-import plotly.graph_objects as go
+import time
+from functools import lru_cache
+from transfer_kernels import batched_map, bielliptic_cost
+from fitness_cache import FitnessCache
+from dv_table import load_table
+from ga_engine import K_EARTH, R_EARTH, ea_early_stopping, ensure_creator, optimize_bounded
+from ga_profiler import GenerationProfiler
+from results_store import ColumnStore
 
 # ===================================================================
 # --- EXPERIMENT CONFIGURATION ---
 # ===================================================================
 SCENARIO = 'FAR_ORBIT'
-if not os.path.exists('results'):
-    os.makedirs('results')
+OPTIMIZER = 'GA'  # 'GA' (DEAP) or 'BRENT' (deterministic bounded 1-D search baseline)
+RB_BOUNDS = (1.01, 500.0)
+CACHE_TOLERANCE = 1e-6  # rb_ratio values closer than this share one fitness evaluation
+CACHE_SIZE = 100000
+CACHE_FILE = os.path.join('results', 'fitness_cache.json')  # reused by later re-runs
+STALL_GENERATIONS = None  # e.g. 8: stop once the best Delta-V stalls (None = all 40 generations)
+TIME_BUDGET = None  # optional wall-clock limit for the evolution, in seconds
+CHECKPOINT_FILE = None  # e.g. os.path.join('results', f'ga_{SCENARIO}.ckpt.gz'): resume after a crash
+CHECKPOINT_EVERY = 10  # generations between checkpoints
+PROFILE_FILE = None  # e.g. os.path.join('results', f'ga_profile_{SCENARIO}.jsonl'): per-phase timings
+USE_DV_TABLE = False  # True: fitness and Hohmann check from the precomputed table (dv_table.py)
+RESULTS_LOG = None  # e.g. os.path.join('results', 'ga_log'): stream generations and run summaries (results_store.py)
 # ===================================================================
 
 # --- Problem Setup ---
-print(f"--- Starting experiment for scenario: {SCENARIO} ---")
-leo_orbit = Orbit.circular(Earth, alt=400 * u.km)
-if SCENARIO == 'GEO':
-    r_target = Earth.R + 35786 * u.km
-    target_orbit = Orbit.circular(Earth, r_target - Earth.R)
-elif SCENARIO == 'FAR_ORBIT':
-    r_target = 20 * leo_orbit.r_p
-    target_orbit = Orbit.circular(Earth, r_target - Earth.R)
-else:
+def scenario_radii(scenario):
+    """Initial and target radii (km) as plain floats, same values as the poliastro setup."""
+    r_initial = R_EARTH + 400.0
+    if scenario == 'GEO':
+        return r_initial, R_EARTH + 35786.0
+    elif scenario == 'FAR_ORBIT':
+        return r_initial, 20 * r_initial
     raise ValueError("Invalid scenario. Please choose 'GEO' or 'FAR_ORBIT'.")
-print(f"Initial Orbit: LEO, radius {leo_orbit.r_p.to(u.km):.2f}")
-print(f"Target Orbit: radius {r_target.to(u.km):.2f}")
+
+@lru_cache(maxsize=None)
+def get_scenario():
+    """leo_orbit, r_target and target_orbit as poliastro objects, built on first use."""
+    import astropy.units as u
+    from poliastro.bodies import Earth
+    from poliastro.twobody import Orbit
+    leo_orbit = Orbit.circular(Earth, alt=400 * u.km)
+    if SCENARIO == 'GEO':
+        r_target = Earth.R + 35786 * u.km
+        target_orbit = Orbit.circular(Earth, r_target - Earth.R)
+    elif SCENARIO == 'FAR_ORBIT':
+        r_target = 20 * leo_orbit.r_p
+        target_orbit = Orbit.circular(Earth, r_target - Earth.R)
+    else:
+        raise ValueError("Invalid scenario. Please choose 'GEO' or 'FAR_ORBIT'.")
+    return leo_orbit, r_target, target_orbit
 
 # --- Fitness Function ---
 def evaluate_bielliptic(individual):
+    import astropy.units as u
+    from poliastro.maneuver import Maneuver
+    leo_orbit, r_target, _ = get_scenario()
     rb_ratio = individual[0]
     if rb_ratio <= 1.0: return 9999999,
     rb = rb_ratio * r_target
@@ -44,33 +75,119 @@ def evaluate_bielliptic(individual):
         return maneuver.get_total_cost().to_value(u.m / u.s),
     except Exception: return 9999999,
 
+# --- Batched Fitness (whole population in one vectorized call) ---
+R_INITIAL_KM, R_TARGET_KM = scenario_radii(SCENARIO)
+
+@lru_cache(maxsize=None)
+def get_dv_table():
+    return load_table() if USE_DV_TABLE else None
+
+n_evaluations = 0  # shared by the GA and the baseline optimizer
+
+def evaluate_population(individuals):
+    global n_evaluations
+    n_evaluations += len(individuals)
+    rb_ratio = np.fromiter((ind[0] for ind in individuals), dtype=float, count=len(individuals))
+    dv_table = get_dv_table()
+    if dv_table is not None:
+        dv, _, valid = dv_table.bielliptic(K_EARTH, R_INITIAL_KM, rb_ratio, R_TARGET_KM)
+        # Genes outside the tabulated range fall back to the closed-form kernel
+        outside = ~valid & (rb_ratio > 1.0)
+        if outside.any():
+            dv[outside], _, valid[outside] = bielliptic_cost(K_EARTH, R_INITIAL_KM, rb_ratio[outside], R_TARGET_KM)
+    else:
+        dv, _, valid = bielliptic_cost(K_EARTH, R_INITIAL_KM, rb_ratio, R_TARGET_KM)
+    return [(f,) for f in np.where(valid, dv * 1000.0, 9999999).tolist()]
+
+# Cache key includes the radii, so entries stay valid if a scenario definition changes
+SCENARIO_KEY = f"{SCENARIO}:{R_INITIAL_KM:.6f}:{R_TARGET_KM:.6f}"
+fitness_cache = FitnessCache(tolerance=CACHE_TOLERANCE, maxsize=CACHE_SIZE)
+
+def evaluate_cached(individuals):
+    # The fitness function of both optimizers: cache, then table / closed form (counted)
+    return fitness_cache.evaluate_many(SCENARIO_KEY, individuals, evaluate_population)
+
 # --- Genetic Algorithm Setup (DEAP) ---
-creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
-creator.create("Individual", list, fitness=creator.FitnessMin)
-toolbox = base.Toolbox()
-toolbox.register("attr_rb_ratio", random.uniform, 1.01, 500.0) # Expanded range
-toolbox.register("individual", tools.initRepeat, creator.Individual, toolbox.attr_rb_ratio, n=1)
-toolbox.register("population", tools.initRepeat, list, toolbox.individual)
-toolbox.register("evaluate", evaluate_bielliptic)
-toolbox.register("mate", tools.cxBlend, alpha=0.5)
-toolbox.register("mutate", tools.mutGaussian, mu=0, sigma=10.0, indpb=0.2)
-toolbox.register("select", tools.selTournament, tournsize=3)
+@lru_cache(maxsize=None)
+def get_toolbox():
+    ensure_creator()  # creator.FitnessMin / creator.Individual, created once per process
+    toolbox = base.Toolbox()
+    toolbox.register("attr_rb_ratio", random.uniform, *RB_BOUNDS) # Expanded range
+    toolbox.register("individual", tools.initRepeat, creator.Individual, toolbox.attr_rb_ratio, n=1)
+    toolbox.register("population", tools.initRepeat, list, toolbox.individual)
+    toolbox.register("evaluate", evaluate_bielliptic)
+    # eaSimple's map(toolbox.evaluate, invalid_ind): the cache and the vectorized evaluator, in one call
+    toolbox.register("map", batched_map(evaluate_bielliptic, evaluate_cached))
+    toolbox.register("mate", tools.cxBlend, alpha=0.5)
+    toolbox.register("mutate", tools.mutGaussian, mu=0, sigma=10.0, indpb=0.2)
+    toolbox.register("select", tools.selTournament, tournsize=3)
+    return toolbox
 
-# --- Main Function to Run and Analyze ---
-def main():
+@lru_cache(maxsize=None)
+def get_results_store():
+    return ColumnStore(RESULTS_LOG) if RESULTS_LOG is not None else None
+
+# --- Optimizers ---
+def run_ga():
+    toolbox = get_toolbox()
     pop = toolbox.population(n=50)
     hof = tools.HallOfFame(1)
     stats = tools.Statistics(lambda ind: ind.fitness.values)
     stats.register("avg", np.mean)
     stats.register("min", np.min)
+    fitness_cache.register_stats(stats)
     print("\nStarting GA evolution process...")
-    algorithms.eaSimple(pop, toolbox, cxpb=0.7, mutpb=0.2, ngen=40,
-                        stats=stats, halloffame=hof, verbose=True)
+    # Same generational loop as algorithms.eaSimple, plus the optional stopping rules,
+    # checkpoints and profiling configured above
+    profiler = GenerationProfiler(PROFILE_FILE) if PROFILE_FILE is not None else None
+    store = get_results_store()
+    writer = store.tagged(scenario=SCENARIO, optimizer=OPTIMIZER) if store is not None else None
+    try:
+        ea_early_stopping(pop, toolbox, cxpb=0.7, mutpb=0.2, ngen=40, stats=stats, halloffame=hof,
+                          stall_generations=STALL_GENERATIONS, time_budget=TIME_BUDGET,
+                          verbose=True, checkpoint_path=CHECKPOINT_FILE,
+                          checkpoint_every=CHECKPOINT_EVERY, profiler=profiler, writer=writer,
+                          keep_logbook=writer is None, cache=fitness_cache)
+    finally:
+        if profiler is not None:
+            profiler.close()
+            print(f"-> Per-generation profile saved to: {PROFILE_FILE}")
     print("Evolution process completed.")
+    return hof[0][0]
+
+# --- Main Function to Run and Analyze ---
+def main():
+    import astropy.units as u
+    from poliastro.maneuver import Maneuver
+
+    if not os.path.exists('results'):
+        os.makedirs('results')
+    print(f"--- Starting experiment for scenario: {SCENARIO} ---")
+    leo_orbit, r_target, target_orbit = get_scenario()
+    print(f"Initial Orbit: LEO, radius {leo_orbit.r_p.to(u.km):.2f}")
+    print(f"Target Orbit: radius {r_target.to(u.km):.2f}")
+
+    loaded = fitness_cache.load(CACHE_FILE)
+    if loaded:
+        print(f"Loaded {loaded} cached fitness values from {CACHE_FILE}")
+    start = time.perf_counter()
+    if OPTIMIZER == 'BRENT':
+        method = "Bounded Brent Search"
+        best_rb_ratio = optimize_bounded(evaluate_cached, RB_BOUNDS)
+    elif OPTIMIZER == 'GA':
+        method = "Genetic Algorithm"
+        best_rb_ratio = run_ga()
+    else:
+        raise ValueError("Invalid optimizer. Please choose 'GA' or 'BRENT'.")
+    optimizer_time = time.perf_counter() - start
+    # Both optimizers go through evaluate_cached: the counts are directly comparable
+    print(f"Fitness evaluations ({method}): {n_evaluations}")
+    print(f"Fitness cache: {fitness_cache.hits} hits, {fitness_cache.misses} misses "
+          f"({fitness_cache.hit_rate():.1%} hit rate), {len(fitness_cache)} entries")
+    fitness_cache.save(CACHE_FILE)
 
     # --- Analysis and Results ---
     print("\n" + "="*20 + " ANALYSIS RESULTS " + "="*20)
-    best_rb_ratio = hof[0][0]
     best_rb = best_rb_ratio * r_target
     ga_maneuver = Maneuver.bielliptic(leo_orbit, best_rb, r_target)
     ga_cost = ga_maneuver.get_total_cost()
@@ -78,7 +195,7 @@ def main():
     hohmann_maneuver = Maneuver.hohmann(leo_orbit, r_target)
     hohmann_cost = hohmann_maneuver.get_total_cost()
     hohmann_time = hohmann_maneuver.get_total_time()
-    print("\n--- Optimal Solution from Genetic Algorithm (Bi-elliptic) ---")
+    print(f"\n--- Optimal Solution from {method} (Bi-elliptic) ---")
     print(f"Optimal intermediate radius ratio (rb / r_target): {best_rb_ratio:.4f}")
     print(f"Optimal intermediate apoapsis: {best_rb.to(u.km):.2f}")
     print(f"  - Delta-V Impulse 1: {np.linalg.norm(ga_maneuver.impulses[0][1]).to(u.m/u.s):.2f}")
@@ -89,6 +206,11 @@ def main():
     print("\n--- Classical Solution (Hohmann Transfer) ---")
     print(f"TOTAL DELTA-V (Hohmann): {hohmann_cost.to(u.m/u.s):.2f}")
     print(f"TOTAL FLIGHT TIME (Hohmann): {hohmann_time.to(u.day):.2f}")
+    dv_table = get_dv_table()
+    if dv_table is not None:
+        table_dv, table_time = dv_table.hohmann(K_EARTH, R_INITIAL_KM, R_TARGET_KM)
+        print(f"Lookup table (Hohmann): {table_dv * 1000:.2f} m / s, {table_time / 86400:.2f} d "
+              f"(table error bound {dv_table.error_bound:.1e})")
     print("\n--- COMPARISON ---")
     if ga_cost < hohmann_cost:
         savings = hohmann_cost - ga_cost
@@ -97,7 +219,33 @@ def main():
         savings = ga_cost - hohmann_cost
         print(f"==> Hohmann solution is superior, saving {savings.to(u.m/u.s):.2f}")
 
-    # --- Plotting and Saving Figures ---
+    store = get_results_store()
+    if store is not None:
+        run = {"scenario": SCENARIO, "optimizer": OPTIMIZER, "evaluations": n_evaluations,
+               "rb_ratio": float(best_rb_ratio)}
+        run.update((f"dv_impulse_{i + 1}", np.linalg.norm(impulse[1]).to_value(u.m / u.s))
+                   for i, impulse in enumerate(ga_maneuver.impulses))
+        run.update({
+            "dv_total": ga_cost.to_value(u.m / u.s),
+            "tof_days": ga_time.to_value(u.day),
+            "hohmann_dv": hohmann_cost.to_value(u.m / u.s),
+            "hohmann_tof_days": hohmann_time.to_value(u.day),
+            "savings_vs_hohmann": (hohmann_cost - ga_cost).to_value(u.m / u.s),
+            "optimizer_time_s": optimizer_time,
+        })
+        store.append("runs", run)
+        store.close()
+        print(f"-> Generation stats and run summary appended to: {RESULTS_LOG}")
+
+    plot_results(ga_maneuver, hohmann_maneuver, ga_cost, hohmann_cost)
+
+# --- Plotting and Saving Figures ---
+def plot_results(ga_maneuver, hohmann_maneuver, ga_cost, hohmann_cost):
+    import astropy.units as u
+    from poliastro.plotting import OrbitPlotter3D
+    import plotly.graph_objects as go
+
+    leo_orbit, _, target_orbit = get_scenario()
     print("\nGenerating and saving comparison plot(s)...")
     ga_transfer1, ga_transfer2, _ = leo_orbit.apply_maneuver(ga_maneuver, intermediate=True)
     hoh_transfer, _ = leo_orbit.apply_maneuver(hohmann_maneuver, intermediate=True)
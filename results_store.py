@@ -0,0 +1,230 @@
+# results_store.py
+# Append-only columnar results store for long GA runs and sweeps. Instead of keeping
+# the whole Logbook (and every run summary) in memory and printing it, the GA streams
+# per-generation stats, timings and per-run summaries to disk as they are produced:
+#
+#   <root>/<table>/schema.json      column names, kinds, category labels
+#   <root>/<table>/<column>.f8      one raw float64 value per row
+#
+# Text values (scenario names, stop reasons) are stored as codes into the category
+# list of their column; missing values are NaN. Worker processes each append to their
+# own part directory (<root>/part-<pid>), and read_table() concatenates them all.
+#
+#   python results_store.py results/ga_log                 # tables and row counts
+#   python results_store.py results/ga_log --table runs --csv results/runs.csv
+
+import argparse
+import csv
+import glob
+import json
+import os
+
+import numpy as np
+
+SCHEMA_FILE = "schema.json"
+
+
+class ColumnStore:
+    def __init__(self, root, part=None):
+        """
+        root: directory of the store (created if needed).
+        part: name of this writer's part directory, e.g. os.getpid() in worker processes,
+        so that several processes can append to the same store.
+        """
+        self.root = root
+        self.path = root if part is None else os.path.join(root, f"part-{part}")
+        self._tables = {}
+
+    def _table(self, table):
+        state = self._tables.get(table)
+        if state is None:
+            directory = os.path.join(self.path, table)
+            os.makedirs(directory, exist_ok=True)
+            schema = _load_schema(directory)
+            state = {"directory": directory, "schema": schema, "files": {},
+                     "rows": _row_count(directory, schema)}
+            for name in schema["columns"]:
+                path = os.path.join(directory, name + ".f8")
+                # Drop the partial row a killed run may have left, so new rows stay aligned
+                os.truncate(path, state["rows"] * 8)
+                state["files"][name] = open(path, 'ab')
+            self._tables[table] = state
+        return state
+
+    def _add_column(self, state, name, kind):
+        schema = state["schema"]
+        schema["columns"][name] = kind
+        if kind == "category":
+            schema["categories"][name] = []
+        f = open(os.path.join(state["directory"], name + ".f8"), 'ab')
+        # Earlier rows did not have this column
+        f.write(np.full(state["rows"], np.nan).tobytes())
+        state["files"][name] = f
+
+    def append(self, table, row):
+        """
+        Append one row (a dict of numbers, bools, strings or None) to `table`. A column's
+        kind is set by its first value: a value of the other kind raises TypeError and
+        nothing of the row is written.
+        """
+        state = self._table(table)
+        schema = state["schema"]
+        values = {}
+        for name, value in row.items():
+            kind = schema["columns"].get(name)
+            if value is None:
+                # Missing: NaN, without fixing the kind of a column not seen yet
+                if kind is not None:
+                    values[name] = np.nan
+                continue
+            if kind is None:
+                kind = "category" if isinstance(value, str) else "float"
+            try:
+                if (kind == "category") != isinstance(value, str):
+                    raise TypeError
+                values[name] = value if kind == "category" else float(value)
+            except (TypeError, ValueError):
+                expected = "text" if kind == "category" else "numbers"
+                raise TypeError(f"Column '{name}' of table '{table}' holds {expected}, "
+                                f"got {type(value).__name__} {value!r}.") from None
+        changed = False
+        for name, value in values.items():
+            if name not in schema["columns"]:
+                self._add_column(state, name, "category" if isinstance(value, str) else "float")
+                changed = True
+            if isinstance(value, str):
+                labels = schema["categories"][name]
+                if value not in labels:
+                    labels.append(value)
+                    changed = True
+                values[name] = float(labels.index(value))
+        if changed:
+            _save_schema(state["directory"], schema)
+        for name, f in state["files"].items():
+            f.write(np.float64(values.get(name, np.nan)).tobytes())
+        state["rows"] += 1
+
+    def tagged(self, **tags):
+        """A writer that adds `tags` (e.g. scenario, seed) to every row it appends."""
+        return _TaggedWriter(self, tags)
+
+    def flush(self):
+        for state in self._tables.values():
+            for f in state["files"].values():
+                f.flush()
+
+    def close(self):
+        for state in self._tables.values():
+            for f in state["files"].values():
+                f.close()
+        self._tables = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _TaggedWriter:
+    def __init__(self, store, tags):
+        self.store = store
+        self.tags = tags
+
+    def append(self, table, row):
+        self.store.append(table, dict(self.tags, **row))
+
+    def tagged(self, **tags):
+        return _TaggedWriter(self.store, dict(self.tags, **tags))
+
+
+def _load_schema(directory):
+    path = os.path.join(directory, SCHEMA_FILE)
+    if not os.path.exists(path):
+        return {"columns": {}, "categories": {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _save_schema(directory, schema):
+    path = os.path.join(directory, SCHEMA_FILE)
+    with open(path + ".tmp", 'w') as f:
+        json.dump(schema, f, indent=1)
+    os.replace(path + ".tmp", path)
+
+
+def _row_count(directory, schema):
+    # A run killed mid-row can leave columns of different lengths: complete rows only
+    sizes = [os.path.getsize(os.path.join(directory, name + ".f8")) // 8 for name in schema["columns"]]
+    return min(sizes, default=0)
+
+
+def list_tables(root):
+    parts = [root] + sorted(glob.glob(os.path.join(root, "part-*")))
+    return sorted({name for part in parts for name in os.listdir(part)
+                   if os.path.exists(os.path.join(part, name, SCHEMA_FILE))})
+
+
+def read_table(root, table):
+    """
+    Read `table` back from every part of the store as a dict of column arrays
+    (float64, or object arrays of labels for text columns). Numeric columns are
+    memory-mapped, so only the columns that are used get loaded.
+    """
+    parts = []
+    for path in [root] + sorted(glob.glob(os.path.join(root, "part-*"))):
+        directory = os.path.join(path, table)
+        if os.path.exists(os.path.join(directory, SCHEMA_FILE)):
+            schema = _load_schema(directory)
+            parts.append((directory, schema, _row_count(directory, schema)))
+    columns = {}
+    for _, schema, _ in parts:
+        columns.update((name, kind) for name, kind in schema["columns"].items() if name not in columns)
+
+    result = {}
+    for name, kind in columns.items():
+        chunks = []
+        for directory, schema, rows in parts:
+            if name not in schema["columns"]:
+                chunks.append(np.full(rows, np.nan) if kind == "float" else np.full(rows, None, dtype=object))
+                continue
+            data = np.memmap(os.path.join(directory, name + ".f8"), dtype=np.float64, mode='r',
+                             shape=(rows,)) if rows else np.empty(0)
+            if kind == "category":
+                labels = np.array(schema["categories"][name] + [None], dtype=object)
+                codes = np.where(np.isnan(data), len(labels) - 1, data).astype(int)
+                data = labels[codes]
+            chunks.append(data)
+        result[name] = chunks[0] if len(chunks) == 1 else np.concatenate(chunks)
+    return result
+
+
+def write_csv(columns, path):
+    names = list(columns)
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(names)
+        writer.writerows(zip(*(columns[name] for name in names)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or export an append-only results store.")
+    parser.add_argument('root')
+    parser.add_argument('--table', default=None)
+    parser.add_argument('--csv', default=None, help="Export --table to this CSV file.")
+    args = parser.parse_args()
+
+    tables = [args.table] if args.table else list_tables(args.root)
+    for table in tables:
+        columns = read_table(args.root, table)
+        rows = len(next(iter(columns.values()))) if columns else 0
+        print(f"{table}: {rows} rows, columns: {', '.join(columns)}")
+    if args.csv:
+        if not args.table:
+            parser.error("--csv needs --table.")
+        write_csv(read_table(args.root, args.table), args.csv)
+        print(f"-> {args.table} exported to: {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
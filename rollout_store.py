@@ -0,0 +1,172 @@
+# rollout_store.py
+# Trajectory recorder for station-keeping evaluations. Per-step data (episode, step,
+# altitude, reward, action) goes into preallocated NumPy arrays instead of Python
+# lists of floats. Without a path, everything stays in memory (the arrays double when
+# full). With a path, the arrays are only a write buffer that is appended to one raw
+# file per field whenever it fills up, so memory stays bounded however long or wide
+# (batched envs, many seeds) the evaluation is:
+#
+#   <path>/trajectory.json     field names and dtypes
+#   <path>/<field>.bin         raw values, one per recorded step
+#
+# Plotting and analysis read the store back with load_trajectories(), as memory-mapped
+# arrays, so only the pages that are used get loaded.
+#
+#   python rollout_store.py results/rollouts            # episodes and row counts
+
+import argparse
+import json
+import os
+
+import numpy as np
+
+META_FILE = "trajectory.json"
+TRAJECTORY_FIELDS = {"episode": np.int32, "step": np.int32, "altitude": np.float64, "reward": np.float64,
+                     "action": np.int8}
+
+
+class TrajectoryRecorder:
+    def __init__(self, path=None, capacity=4320, fields=None):
+        """
+        path: directory to spill to (None: keep everything in memory).
+        capacity: rows preallocated (one 30-day episode of StationKeepingEnv by default);
+        the write buffer size when `path` is set.
+        fields: name -> dtype of the recorded values (default TRAJECTORY_FIELDS).
+        """
+        self.path = path
+        self.fields = {name: np.dtype(dtype) for name, dtype in (fields or TRAJECTORY_FIELDS).items()}
+        self.capacity = capacity
+        self._buffers = [np.empty(capacity, dtype) for dtype in self.fields.values()]
+        self._n = 0  # rows in the buffers
+        self._flushed = 0  # rows already on disk
+        self._files = None
+        if path is not None:
+            self._open()
+
+    def _open(self):
+        os.makedirs(self.path, exist_ok=True)
+        meta_path = os.path.join(self.path, META_FILE)
+        meta = {"fields": {name: dtype.str for name, dtype in self.fields.items()}}
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                if json.load(f) != meta:
+                    raise ValueError(f"{self.path} holds trajectories with other fields.")
+        else:
+            with open(meta_path, 'w') as f:
+                json.dump(meta, f, indent=1)
+        # Continue an existing store; drop the partial row a killed run may have left
+        self._flushed = _row_count(self.path, self.fields)
+        self._files = []
+        for name, dtype in self.fields.items():
+            file_path = os.path.join(self.path, name + ".bin")
+            open(file_path, 'ab').close()
+            os.truncate(file_path, self._flushed * dtype.itemsize)
+            self._files.append(open(file_path, 'ab'))
+
+    def __len__(self):
+        return self._flushed + self._n
+
+    def _make_room(self):
+        if self.path is not None:
+            self.flush()
+            return
+        self.capacity *= 2
+        for i, buffer in enumerate(self._buffers):
+            grown = np.empty(self.capacity, buffer.dtype)
+            grown[:self._n] = buffer[:self._n]
+            self._buffers[i] = grown
+
+    def record(self, *values):
+        """Append one row: one value per field, in field order."""
+        if self._n == self.capacity:
+            self._make_room()
+        n = self._n
+        for buffer, value in zip(self._buffers, values):
+            buffer[n] = value
+        self._n = n + 1
+
+    def extend(self, *columns):
+        """Append many rows at once (e.g. one step of a vectorized env): one array per field."""
+        total = len(columns[0])
+        start = 0
+        while start < total:
+            if self._n == self.capacity:
+                self._make_room()
+            take = min(total - start, self.capacity - self._n)
+            for buffer, column in zip(self._buffers, columns):
+                buffer[self._n:self._n + take] = column[start:start + take]
+            self._n += take
+            start += take
+
+    def flush(self):
+        """Write the buffered rows to disk (no-op in memory)."""
+        if self.path is None or self._n == 0:
+            return
+        for f, buffer in zip(self._files, self._buffers):
+            buffer[:self._n].tofile(f)
+            f.flush()
+        self._flushed += self._n
+        self._n = 0
+
+    def columns(self):
+        """All recorded rows as a dict of arrays (memory-mapped when spilled to disk)."""
+        if self.path is None:
+            return {name: buffer[:self._n] for name, buffer in zip(self.fields, self._buffers)}
+        self.flush()
+        return load_trajectories(self.path)
+
+    def close(self):
+        self.flush()
+        for f in self._files or ():
+            f.close()
+        self._files = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _row_count(path, fields):
+    sizes = [os.path.getsize(os.path.join(path, name + ".bin")) // dtype.itemsize
+             if os.path.exists(os.path.join(path, name + ".bin")) else 0
+             for name, dtype in fields.items()]
+    return min(sizes, default=0)
+
+
+def load_trajectories(path):
+    """Read a spilled store back as a dict of read-only memory-mapped arrays."""
+    with open(os.path.join(path, META_FILE)) as f:
+        fields = {name: np.dtype(dtype) for name, dtype in json.load(f)["fields"].items()}
+    rows = _row_count(path, fields)
+    return {name: np.memmap(os.path.join(path, name + ".bin"), dtype=dtype, mode='r', shape=(rows,))
+            if rows else np.empty(0, dtype) for name, dtype in fields.items()}
+
+
+def episode_slices(episode):
+    """(episode id, slice) of each run of consecutive rows of the same episode."""
+    bounds = np.concatenate([[0], np.flatnonzero(np.diff(episode)) + 1, [len(episode)]])
+    return [(int(episode[start]), slice(int(start), int(stop))) for start, stop in zip(bounds[:-1], bounds[1:])]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect a spilled trajectory store.")
+    parser.add_argument('path')
+    args = parser.parse_args()
+
+    columns = load_trajectories(args.path)
+    episodes = episode_slices(columns["episode"]) if "episode" in columns else []
+    rows = len(next(iter(columns.values()))) if columns else 0
+    print(f"{args.path}: {rows} steps, {len(episodes)} episodes, fields: {', '.join(columns)}")
+    for episode, rows in episodes[:20]:
+        line = f"episode {episode}: {rows.stop - rows.start} steps"
+        if "reward" in columns:
+            line += f", reward {float(columns['reward'][rows].sum()):.1f}"
+        if "action" in columns:
+            line += f", {int(columns['action'][rows].sum())} thrusts"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# scenario_sweep.py
+# One entry point for the GEO / FAR_ORBIT style experiments: instead of editing the
+# SCENARIO global in test_GEO.py, code_FAR_ORBIT.py, fullcode.py, ... run the GA for
+# a list or grid of target radii and initial altitudes in parallel and write one
+# consolidated results table.
+#
+# Examples:
+#   python scenario_sweep.py --preset GEO FAR_ORBIT
+#   python scenario_sweep.py --altitudes 300 400 500 --target-grid 10000 200000 100 --workers 64
+
+import argparse
+import csv
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from ga_engine import R_EARTH, run_ga
+from results_store import ColumnStore
+
+# The two scenarios of the paper scripts (initial altitude km, target radius km)
+PRESETS = {
+    'GEO': (400.0, R_EARTH + 35786.0),
+    'FAR_ORBIT': (400.0, 20 * (R_EARTH + 400.0)),
+}
+
+
+def build_cases(altitudes=(), targets=(), target_grid=None, presets=()):
+    """Cartesian product of initial altitudes and target radii, plus named presets."""
+    targets = list(targets)
+    if target_grid is not None:
+        start, stop, num = target_grid
+        targets.extend(np.geomspace(start, stop, int(num)).tolist())
+    cases = [(name,) + PRESETS[name] for name in presets]
+    for alt, r_target in itertools.product(altitudes, targets):
+        cases.append((f"alt{alt:g}_r{r_target:.0f}", float(alt), float(r_target)))
+    # A transfer only makes sense outwards
+    return [case for case in cases if case[2] > R_EARTH + case[1]]
+
+
+def _run_case(args):
+    (name, altitude, r_target), ga_kwargs, log_dir = args
+    tags = dict(scenario=name, altitude_km=altitude)
+    if log_dir is None:
+        return dict(tags, **run_ga(R_EARTH + altitude, r_target, **ga_kwargs))
+    # One part directory per worker process: appends never interleave
+    with ColumnStore(log_dir, part=os.getpid()) as store:
+        return dict(tags, **run_ga(R_EARTH + altitude, r_target, writer=store, tags=tags, **ga_kwargs))
+
+
+def run_sweep(cases, workers=None, pop_size=50, ngen=40, seed=None, stall_generations=None, log_dir=None):
+    """
+    Run the GA for every case in a process pool; results keep the order of `cases`.
+    With `log_dir`, per-generation stats and run summaries are streamed to a
+    results_store.ColumnStore there as the runs progress.
+    """
+    ga_kwargs = dict(pop_size=pop_size, ngen=ngen, seed=seed, stall_generations=stall_generations)
+    tasks = [(case, ga_kwargs, log_dir) for case in cases]
+    workers = workers or os.cpu_count()
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_run_case, tasks, chunksize=chunksize))
+
+
+def write_table(results, path):
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(results[0].keys()))
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GA sweep over initial altitudes and target radii.")
+    parser.add_argument('--preset', nargs='*', default=[], choices=sorted(PRESETS),
+                        help="Named scenarios from the paper scripts.")
+    parser.add_argument('--altitudes', nargs='*', type=float, default=[400.0],
+                        help="Initial circular orbit altitudes (km).")
+    parser.add_argument('--targets', nargs='*', type=float, default=[],
+                        help="Target circular orbit radii (km).")
+    parser.add_argument('--target-grid', nargs=3, type=float, metavar=('START', 'STOP', 'NUM'),
+                        help="Log-spaced grid of target radii (km).")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: all cores).")
+    parser.add_argument('--pop', type=int, default=50)
+    parser.add_argument('--ngen', type=int, default=40)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--stall', type=int, default=None,
+                        help="Stop a GA run after this many generations without improvement.")
+    parser.add_argument('--output', default=os.path.join('results', 'scenario_sweep.csv'))
+    parser.add_argument('--log', default=None,
+                        help="Stream per-generation stats and run summaries to this results store.")
+    args = parser.parse_args()
+
+    cases = build_cases(args.altitudes, args.targets, args.target_grid, args.preset)
+    if not cases:
+        parser.error("No valid scenario: give --preset, --targets or --target-grid.")
+
+    print(f"--- Scenario sweep: {len(cases)} scenarios ---")
+    start = time.perf_counter()
+    results = run_sweep(cases, args.workers, args.pop, args.ngen, args.seed, args.stall, args.log)
+    elapsed = time.perf_counter() - start
+    write_table(results, args.output)
+    print(f"Finished in {elapsed:.2f} s -> results table saved to: {args.output}")
+    if args.log is not None:
+        print(f"-> Generation stats and run summaries streamed to: {args.log}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# startup_budget.py
+# Startup-time budget for headless, evaluation-only runs (worker processes, tests):
+# each check starts a fresh interpreter, imports a GA module, evaluates one
+# population and reports the wall time and whether any heavy module (poliastro,
+# astropy, plotly, scipy, matplotlib) was pulled in. Exits with status 1 if a check
+# goes over its budget or imports a heavy module.
+#
+# Modules covered (CHECKS), import + one batched evaluation + one population:
+#   project_ga_final_for_paper_english, ga_engine, test_GEO, code_GEO, fullcode
+# Modules whose fitness is poliastro only (no headless evaluation), import + one population:
+#   project_ga_final_for_paper, fullcode_GEO, test_FAR, code_FAR_ORBIT
+#
+#   python startup_budget.py --budget 1.0
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+HEAVY_MODULES = ("poliastro", "astropy", "plotly", "scipy", "matplotlib")
+
+CHECKS = {
+    "project_ga_final_for_paper_english": (
+        "import project_ga_final_for_paper_english as m\n"
+        "m.evaluate_population([[1.0 + i / 10] for i in range(1000)])\n"
+        "m.get_toolbox().population(n=50)\n"
+    ),
+    "ga_engine": (
+        "from ga_engine import BiellipticProblem\n"
+        "BiellipticProblem(6778.1366, 42164.1366).evaluate_population([[1.0 + i / 10] for i in range(1000)])\n"
+    ),
+}
+for _name in ("test_GEO", "code_GEO", "fullcode"):
+    CHECKS[_name] = (
+        f"import {_name} as m\n"
+        "m.evaluate_population([[1.0 + i / 10] for i in range(1000)])\n"
+        "m.get_toolbox().population(n=50)\n"
+    )
+for _name in ("project_ga_final_for_paper", "fullcode_GEO", "test_FAR", "code_FAR_ORBIT"):
+    CHECKS[_name] = f"import {_name} as m\nm.get_toolbox().population(n=50)\n"
+
+PROBE = (
+    "import sys, time, json\n"
+    "t0 = time.perf_counter()\n"
+    "{code}"
+    "elapsed = time.perf_counter() - t0\n"
+    "heavy = sorted({{name.split('.')[0] for name in sys.modules}} & set({heavy!r}))\n"
+    "print(json.dumps({{'in_process_s': elapsed, 'heavy_modules': heavy}}))\n"
+)
+
+
+def measure(code, repeats=3):
+    """Best-of-`repeats` timings of `code` in a fresh interpreter (process and in-process)."""
+    best = None
+    here = os.path.dirname(os.path.abspath(__file__))
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", PROBE.format(code=code, heavy=HEAVY_MODULES)],
+                             cwd=here, capture_output=True, text=True, check=True)
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        result["process_s"] = time.perf_counter() - t0
+        if best is None or result["process_s"] < best["process_s"]:
+            best = result
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup-time budget for headless evaluation-only runs.")
+    parser.add_argument('--budget', type=float, default=1.0, help="Max seconds per fresh process.")
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    failed = False
+    for name, code in CHECKS.items():
+        result = measure(code, args.repeats)
+        ok = result["process_s"] <= args.budget and not result["heavy_modules"]
+        failed |= not ok
+        print(f"{'OK  ' if ok else 'FAIL'} {name:38s} process {result['process_s']:.3f} s "
+              f"(import + evaluation {result['in_process_s']:.3f} s, budget {args.budget:.2f} s), "
+              f"heavy modules: {', '.join(result['heavy_modules']) or 'none'}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# station_keeping_kernels.py
+# Closed-form physics of the StationKeepingEnv step in project_drl.py, as plain-float
+# NumPy kernels that work on scalars and on arrays of satellites alike (plus math-only
+# scalar forms for the single env).
+#
+# The env rebuilds a circular orbit every step (Orbit.circular, anomaly 0) and
+# propagates it by time_step, so at the start of a step the satellite sits on a
+# circular orbit of radius r at anomaly theta = n * time_step (theta = 0 right after
+# reset). A thrust step adds the inertial impulse [0, dv, 0]: radial component
+# dv * sin(theta), tangential v + dv * cos(theta). The env then reads r_p of the
+# resulting orbit, lowers it by the decay and starts over with a circular orbit.
+
+import math
+
+import numpy as np
+
+from earth_constants import K_EARTH, R_EARTH  # re-exported for project_drl / atmosphere
+
+TWO_PI = 2 * math.pi
+
+
+def step_anomaly(k, r, dt):
+    """Anomaly (rad) reached after propagating a circular orbit of radius r (km) by dt (s) from 0."""
+    return np.mod(np.sqrt(k / r**3) * dt, 2 * np.pi)
+
+
+def perigee_after_impulse(k, r, theta, dv):
+    """
+    Periapsis radius (km) after adding the inertial impulse [0, dv, 0] (km/s) on a
+    circular orbit of radius r (km) at anomaly theta (rad).
+    """
+    v_circ = np.sqrt(k / r)
+    v_r = dv * np.sin(theta)
+    v_t = v_circ + dv * np.cos(theta)
+    h2 = (r * v_t)**2
+    energy = 0.5 * (v_r**2 + v_t**2) - k / r
+    ecc = np.sqrt(np.maximum(1.0 + 2.0 * energy * h2 / k**2, 0.0))
+    return h2 / (k * (1.0 + ecc))
+
+
+# --- Scalar forms (one satellite, Python floats) ---
+# Same formulas with the math module: NumPy ufuncs on scalars cost about 1 us each,
+# which dominated the single-env step. sin / cos may differ from NumPy's in the last bit.
+
+def step_anomaly_scalar(k, r, dt):
+    return math.sqrt(k / r**3) * dt % TWO_PI
+
+
+def perigee_after_impulse_scalar(k, r, theta, dv):
+    v_circ = math.sqrt(k / r)
+    v_r = dv * math.sin(theta)
+    v_t = v_circ + dv * math.cos(theta)
+    h2 = (r * v_t)**2
+    energy = 0.5 * (v_r**2 + v_t**2) - k / r
+    ecc = math.sqrt(max(1.0 + 2.0 * energy * h2 / k**2, 0.0))
+    return h2 / (k * (1.0 + ecc))
@@ -0,0 +1,94 @@
+# station_keeping_parity.py
+# Parity check and benchmark of the two physics modes of StationKeepingEnv
+# (project_drl.py): the poliastro step (Orbit.circular + apply_maneuver +
+# Orbit.propagate) and the closed-form 'analytic' step. Both envs replay the same
+# seeded random action sequences; observations, rewards and end flags are compared
+# step by step, and the steps/sec of each mode are reported.
+#
+#   python station_keeping_parity.py                      # 5 episodes of 2000 steps
+#   python station_keeping_parity.py --steps 4320 --episodes 20 --thrust-prob 0.5
+#
+# Exits with status 1 when a difference exceeds the tolerances.
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from project_drl import StationKeepingEnv
+
+
+def rollout(env, actions, seed=None):
+    """Play `actions` from reset; returns (observations, rewards, terminated, truncated, seconds)."""
+    env.reset(seed=seed)
+    observations = np.zeros((len(actions), 2))
+    rewards = np.zeros(len(actions))
+    terminated = np.zeros(len(actions), dtype=bool)
+    truncated = np.zeros(len(actions), dtype=bool)
+    t0 = time.perf_counter()
+    for i, action in enumerate(actions):
+        observations[i], rewards[i], terminated[i], truncated[i], _ = env.step(action)
+        if terminated[i] or truncated[i]:
+            env.reset()
+    return observations, rewards, terminated, truncated, time.perf_counter() - t0
+
+
+def compare(reference, candidate, obs_atol=1e-6, reward_atol=1e-6):
+    """Max differences between two rollouts and whether they are within the tolerances."""
+    obs_diff = float(np.abs(reference[0] - candidate[0]).max(initial=0.0))
+    reward_diff = float(np.abs(reference[1] - candidate[1]).max(initial=0.0))
+    flags_equal = bool(np.array_equal(reference[2], candidate[2]) and np.array_equal(reference[3], candidate[3]))
+    return {"obs_diff": obs_diff, "reward_diff": reward_diff, "flags_equal": flags_equal,
+            "ok": obs_diff <= obs_atol and reward_diff <= reward_atol and flags_equal}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parity check and benchmark of the StationKeepingEnv physics modes.")
+    parser.add_argument('--episodes', type=int, default=5, help="Random action sequences to replay.")
+    parser.add_argument('--steps', type=int, default=2000, help="Steps per action sequence.")
+    parser.add_argument('--thrust-prob', type=float, default=0.3, help="Probability of action 1 at each step.")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--decay-model', default='constant', choices=['constant', 'drag'])
+    parser.add_argument('--obs-atol', type=float, default=1e-6, help="Tolerance on observations (km).")
+    parser.add_argument('--reward-atol', type=float, default=1e-6)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    sequences = [(rng.random(args.steps) < args.thrust_prob).astype(int) for _ in range(args.episodes)]
+    analytic = StationKeepingEnv(physics='analytic', decay_model=args.decay_model)
+    try:
+        reference = StationKeepingEnv(physics='poliastro', decay_model=args.decay_model)
+        reference.reset()
+    except ImportError as e:
+        reference = None
+        print(f"poliastro path unavailable ({e}): parity NOT checked, benchmarking the analytic mode only.")
+
+    print(f"--- StationKeepingEnv physics parity: {args.episodes} x {args.steps} steps, "
+          f"thrust probability {args.thrust_prob}, {args.decay_model} decay ---")
+    timings = {"analytic": 0.0, "poliastro": 0.0}
+    failures = 0
+    for episode, actions in enumerate(sequences):
+        fast = rollout(analytic, actions, seed=args.seed + episode)
+        timings["analytic"] += fast[-1]
+        if reference is None:
+            continue
+        slow = rollout(reference, actions, seed=args.seed + episode)
+        timings["poliastro"] += slow[-1]
+        result = compare(slow, fast, args.obs_atol, args.reward_atol)
+        failures += not result["ok"]
+        print(f"episode {episode}: max |d obs| {result['obs_diff']:.3e} km, "
+              f"max |d reward| {result['reward_diff']:.3e}, end flags equal: {result['flags_equal']}"
+              f"{'' if result['ok'] else '  MISMATCH'}")
+
+    total_steps = args.episodes * args.steps
+    print(f"analytic : {total_steps / timings['analytic']:,.0f} steps/s")
+    if reference is not None:
+        print(f"poliastro: {total_steps / timings['poliastro']:,.0f} steps/s "
+              f"(analytic is {timings['poliastro'] / timings['analytic']:.0f}x faster)")
+        print("Parity OK." if not failures else f"{failures} episode(s) out of tolerance.")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+# station_keeping_vec.py
+# Vectorized version of StationKeepingEnv (project_drl.py): N independent satellites
+# held in NumPy arrays (orbit radius, anomaly, step counter) and stepped together
+# with the closed-form kernels of station_keeping_kernels.py, instead of one poliastro
+# Orbit per satellite. Same observation, reward shaping, termination (-100 below the
+# critical altitude), truncation (30 days) and decay models (constant or tabulated
+# drag, see atmosphere.py) as the single env.
+#
+# Follows gymnasium's VectorEnv API with same-step autoreset: an env that ends is
+# reset inside step(), its last observation goes to infos["final_obs"] (mask
+# infos["_final_obs"]). to_sb3() wraps it as a stable-baselines3 VecEnv for PPO:
+#
+#   env = to_sb3(StationKeepingVecEnv(4096))
+#   PPO("MlpPolicy", env, n_steps=64, device='cpu').learn(10_000_000)
+
+import time
+from functools import lru_cache
+
+import numpy as np
+from gymnasium import spaces
+from gymnasium.vector import AutoresetMode, VectorEnv
+from gymnasium.vector.utils import batch_space
+
+from atmosphere import get_decay_table
+from station_keeping_kernels import K_EARTH, R_EARTH, perigee_after_impulse, step_anomaly
+
+
+class StationKeepingVecEnv(VectorEnv):
+    metadata = {"autoreset_mode": AutoresetMode.SAME_STEP}
+
+    def __init__(self, num_envs, target_altitude=400.0, allowed_band=5.0, critical_altitude=250.0,
+                 thrust_magnitude=1.0, time_step=600.0, decay_per_step=0.01, max_days=30.0,
+                 decay_model='constant', ballistic_coefficient=50.0, f107=150.0):
+        """
+        Altitudes and decay in km, thrust in m/s, time step in s (defaults of StationKeepingEnv).
+        decay_model 'drag' replaces decay_per_step by the drag table of atmosphere.py, with
+        ballistic_coefficient m / (Cd A) in kg/m^2 and the F10.7 solar flux in sfu.
+        """
+        if decay_model not in ('constant', 'drag'):
+            raise ValueError("decay_model must be 'constant' or 'drag'.")
+        self.num_envs = num_envs
+        self.target_altitude = target_altitude
+        self.target_radius = R_EARTH + target_altitude
+        self.allowed_band = allowed_band
+        self.critical_radius = R_EARTH + critical_altitude
+        self.thrust = thrust_magnitude / 1000.0  # km/s
+        self.time_step = time_step
+        self.decay_per_step = decay_per_step
+        self.max_steps = int(max_days * 86400.0 / time_step)
+        self.decay_model = decay_model
+        self._drag = get_decay_table(f107) if decay_model == 'drag' else None
+        self._drag_scale = time_step / (ballistic_coefficient * 1000.0)
+
+        self.single_action_space = spaces.Discrete(2)
+        self.single_observation_space = spaces.Box(
+            low=np.array([-200, -1]), high=np.array([200, 1]), dtype=np.float32
+        )
+        self.action_space = batch_space(self.single_action_space, num_envs)
+        self.observation_space = batch_space(self.single_observation_space, num_envs)
+
+        self.radius = np.full(num_envs, self.target_radius)
+        self.anomaly = np.zeros(num_envs)
+        self.steps = np.zeros(num_envs, dtype=np.int64)
+        self._observations = np.zeros((num_envs, 2), dtype=np.float32)
+        self.total_steps = 0  # env-steps, i.e. num_envs per step() call
+        self.step_time_s = 0.0
+
+    @property
+    def altitude(self):
+        """Current altitudes (km), as read from env.current_orbit.r_p in the single env."""
+        return self.radius - R_EARTH
+
+    def throughput(self):
+        """Env-steps run, time spent in step() and env-steps/sec (same keys as StationKeepingEnv)."""
+        return {"physics": "analytic", "steps": self.total_steps, "step_time_s": self.step_time_s,
+                "steps_per_s": self.total_steps / self.step_time_s if self.step_time_s else None}
+
+    def decay_at(self, altitude):
+        """Altitude lost (km) in one step from `altitude` (km, array)."""
+        if self._drag is None:
+            return self.decay_per_step
+        return self._drag.rates(altitude) * self._drag_scale
+
+    def _reset_envs(self, mask):
+        self.radius[mask] = self.target_radius
+        self.anomaly[mask] = 0.0
+        self.steps[mask] = 0
+        self._observations[mask, 0] = 0.0
+        self._observations[mask, 1] = self.decay_at(self.target_altitude)
+
+    def reset(self, *, seed=None, options=None):
+        super().reset(seed=seed)
+        self._reset_envs(slice(None))
+        return self._observations.copy(), {}
+
+    def step(self, actions):
+        t0 = time.perf_counter()
+        actions = np.asarray(actions)
+        thrust = actions == 1
+        self.steps += 1
+
+        # Physics step: impulse, perigee of the new orbit minus the decay, then a new
+        # circular orbit propagated by one time step
+        radius_before = np.where(
+            thrust, perigee_after_impulse(K_EARTH, self.radius, self.anomaly, self.thrust), self.radius)
+        altitude_before = radius_before - R_EARTH
+        self.radius = R_EARTH + np.maximum(altitude_before - self.decay_at(altitude_before), 0.0)
+        self.anomaly = step_anomaly(K_EARTH, self.radius, self.time_step)
+
+        altitude_error = self.radius - self.target_radius
+        in_band = np.abs(altitude_error) <= self.allowed_band
+        rewards = np.where(in_band, 1.0, -(altitude_error / self.allowed_band)**2)
+        rewards -= 0.1 * thrust
+        terminations = self.radius < self.critical_radius
+        rewards[terminations] = -100.0
+        truncations = self.steps >= self.max_steps
+
+        self._observations[:, 0] = altitude_error
+        self._observations[:, 1] = radius_before - self.radius
+        infos = {}
+        done = terminations | truncations
+        if done.any():
+            final_obs = np.zeros_like(self._observations)
+            final_obs[done] = self._observations[done]
+            infos = {"final_obs": final_obs, "_final_obs": done}
+            self._reset_envs(done)
+        self.step_time_s += time.perf_counter() - t0
+        self.total_steps += self.num_envs
+        return self._observations.copy(), rewards, terminations, truncations, infos
+
+
+@lru_cache(maxsize=None)
+def _sb3_vec_env_class():
+    from stable_baselines3.common.vec_env import VecEnv
+
+    class SB3VecEnv(VecEnv):
+        """stable-baselines3 VecEnv interface over a gymnasium same-step-autoreset VectorEnv."""
+
+        def __init__(self, env):
+            self.env = env
+            self._actions = None
+            super().__init__(env.num_envs, env.single_observation_space, env.single_action_space)
+
+        def reset(self):
+            seeds = getattr(self, "_seeds", [None])
+            obs, _ = self.env.reset(seed=seeds[0])
+            if hasattr(self, "_reset_seeds"):
+                self._reset_seeds()
+            return obs
+
+        def step_async(self, actions):
+            self._actions = actions
+
+        def step_wait(self):
+            obs, rewards, terminations, truncations, infos = self.env.step(self._actions)
+            dones = terminations | truncations
+            episode_infos = [{} for _ in range(self.num_envs)]
+            for i in np.flatnonzero(dones):
+                episode_infos[i]["terminal_observation"] = infos["final_obs"][i]
+                episode_infos[i]["TimeLimit.truncated"] = bool(truncations[i] and not terminations[i])
+            return obs, rewards.astype(np.float32), dones, episode_infos
+
+        def close(self):
+            self.env.close()
+
+        def get_attr(self, attr_name, indices=None):
+            return [getattr(self.env, attr_name)] * len(self._get_indices(indices))
+
+        def set_attr(self, attr_name, value, indices=None):
+            setattr(self.env, attr_name, value)
+
+        def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+            result = getattr(self.env, method_name)(*method_args, **method_kwargs)
+            return [result] * len(self._get_indices(indices))
+
+        def env_is_wrapped(self, wrapper_class, indices=None):
+            return [False] * len(self._get_indices(indices))
+
+    return SB3VecEnv
+
+
+def to_sb3(env):
+    """Wrap a StationKeepingVecEnv as a stable-baselines3 VecEnv (PPO, VecMonitor, ...)."""
+    return _sb3_vec_env_class()(env)
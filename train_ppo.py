@@ -0,0 +1,218 @@
+# train_ppo.py
+# Multi-process PPO training harness for the station-keeping task of project_drl.py.
+# Instead of one StationKeepingEnv stepped on the training process, N envs run in
+# worker processes (SubprocVecEnv, env of rank i seeded with seed + i), or, with
+# --vectorized, as one in-process StationKeepingVecEnv. Timesteps/sec are measured
+# every rollout (collection alone and end to end, PPO updates included), printed,
+# sent to the SB3 logger and optionally streamed to a results store, so training
+# budgets can be sized from measured throughput.
+#
+# --curriculum trains on the cheap 'analytic' backend and, every --validate-every
+# timesteps, validates the policy on the expensive poliastro backend, with the
+# surrogate replaying the same actions to measure its drift (multi_fidelity.py).
+#
+#   python train_ppo.py --workers 16 --timesteps 2000000 --physics analytic
+#   python train_ppo.py --curriculum --validate-every 200000 --decay-model drag
+#   python train_ppo.py --vectorized --workers 1024 --timesteps 50000000 --batch-size 8192
+#   python train_ppo.py --workers 8 --log results/training_log     # see results_store.py
+
+import argparse
+import os
+import time
+from functools import lru_cache
+
+from multi_fidelity import model_policy, validate
+from project_drl import StationKeepingEnv
+from results_store import ColumnStore
+
+
+@lru_cache(maxsize=None)
+def _throughput_callback_class():
+    from stable_baselines3.common.callbacks import BaseCallback
+
+    class ThroughputCallback(BaseCallback):
+        """Timesteps/sec of every rollout, printed, recorded in the SB3 logger and in `writer`."""
+
+        def __init__(self, writer=None, verbose=1):
+            super().__init__(verbose)
+            self.writer = writer
+            self.history = []
+
+        def _on_training_start(self):
+            # Called again by every learn() of a curriculum: elapsed_s keeps counting
+            self._last_time = time.perf_counter()
+            self._start = getattr(self, "_start", self._last_time)
+            self._last_steps = self.num_timesteps
+
+        def _on_rollout_start(self):
+            self._rollout_start = time.perf_counter()
+            self._rollout_steps = self.num_timesteps
+
+        def _on_step(self):
+            return True
+
+        def _on_rollout_end(self):
+            now = time.perf_counter()
+            steps = self.num_timesteps
+            episodes = self.model.ep_info_buffer
+            row = {
+                "timesteps": steps,
+                "elapsed_s": now - self._start,
+                # env stepping + policy inference only
+                "collect_steps_per_s": (steps - self._rollout_steps) / (now - self._rollout_start),
+                # since the previous rollout end, so including the PPO update in between
+                "steps_per_s": (steps - self._last_steps) / (now - self._last_time),
+                "ep_rew_mean": sum(e["r"] for e in episodes) / len(episodes) if episodes else None,
+                "ep_len_mean": sum(e["l"] for e in episodes) / len(episodes) if episodes else None,
+            }
+            self._last_time, self._last_steps = now, steps
+            self.history.append(row)
+            self.logger.record("time/steps_per_s", row["steps_per_s"])
+            self.logger.record("time/collect_steps_per_s", row["collect_steps_per_s"])
+            if self.writer is not None:
+                self.writer.append("training", row)
+            if self.verbose:
+                print(f"{steps:>12,d} steps  {row['steps_per_s']:>10,.0f} steps/s "
+                      f"(collection {row['collect_steps_per_s']:,.0f} steps/s)  "
+                      f"ep_rew_mean {row['ep_rew_mean'] if episodes else float('nan'):.1f}")
+
+    return ThroughputCallback
+
+
+def build_vec_env(n_envs=8, seed=0, physics='poliastro', vectorized=False, start_method=None, env_kwargs=None):
+    """
+    n_envs StationKeepingEnv in worker processes (a DummyVecEnv when n_envs is 1), env
+    of rank i seeded with seed + i, wrapped in Monitor for the episode statistics.
+    vectorized: one StationKeepingVecEnv of n_envs satellites instead (closed-form
+    physics, no worker processes). env_kwargs: decay_model, ballistic_coefficient, f107.
+    """
+    from stable_baselines3.common import env_util
+    from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv, VecMonitor
+
+    if vectorized:
+        from station_keeping_vec import StationKeepingVecEnv, to_sb3
+        env = VecMonitor(to_sb3(StationKeepingVecEnv(n_envs, **(env_kwargs or {}))))
+        env.seed(seed)
+        return env
+    env_kwargs = dict(env_kwargs or {}, physics=physics)
+    if n_envs == 1:
+        return env_util.make_vec_env(StationKeepingEnv, 1, seed=seed, env_kwargs=env_kwargs,
+                                     vec_env_cls=DummyVecEnv)
+    return env_util.make_vec_env(StationKeepingEnv, n_envs, seed=seed, env_kwargs=env_kwargs,
+                                 vec_env_cls=SubprocVecEnv, vec_env_kwargs={"start_method": start_method})
+
+
+def backend_throughput(env, vectorized=False):
+    """Steps/sec of the physics backend of the training envs, from their own counters (per env)."""
+    # The vectorized env is a single object behind every index
+    stats = env.env_method('throughput', indices=[0] if vectorized else None)
+    step_time = sum(s["step_time_s"] for s in stats)
+    return sum(s["steps"] for s in stats) / step_time if step_time else None
+
+
+def train(total_timesteps=1000000, n_envs=8, seed=0, physics='poliastro', vectorized=False, n_steps=None,
+          batch_size=64, start_method=None, writer=None, verbose=1, env_kwargs=None, validate_every=None,
+          validation_physics='poliastro', validation_episodes=1, validation_steps=None, **ppo_kwargs):
+    """
+    Train PPO("MlpPolicy") on n_envs parallel envs. n_steps defaults to 2048 // n_envs
+    (at least 64), so that a rollout has the same size as with the single env of
+    project_drl.py. Returns (model, info) with the measured throughput in info.
+
+    Curriculum: with validate_every, training stops every validate_every timesteps to
+    run the deterministic policy on the `validation_physics` backend (seeds from
+    1000000 + seed), mirrored on the training backend for the drift. The summaries
+    go to info["validations"] and to the 'validation' table of `writer`.
+    """
+    from stable_baselines3 import PPO
+
+    env = build_vec_env(n_envs, seed, physics, vectorized, start_method, env_kwargs)
+    n_steps = n_steps or max(64, 2048 // n_envs)
+    model = PPO("MlpPolicy", env, n_steps=n_steps, batch_size=batch_size, seed=seed, verbose=0,
+                device='cpu', **ppo_kwargs)
+    callback = _throughput_callback_class()(writer, verbose)
+    training_physics = 'analytic' if vectorized else physics
+    validations = []
+    t0 = time.perf_counter()
+    try:
+        while model.num_timesteps < total_timesteps:
+            chunk = min(validate_every or total_timesteps, total_timesteps - model.num_timesteps)
+            model.learn(total_timesteps=chunk, callback=callback, reset_num_timesteps=False)
+            if validate_every is None:
+                break
+            summary = validate(model_policy(model), validation_physics,
+                               training_physics if training_physics != validation_physics else None,
+                               validation_episodes, 1000000 + seed, validation_steps, **(env_kwargs or {}))
+            summary.update(timesteps=model.num_timesteps,
+                           training_steps_per_s=backend_throughput(env, vectorized))
+            validations.append(summary)
+            if writer is not None:
+                writer.append("validation", summary)
+            if verbose:
+                drift = f", drift {summary['max_drift_km']:.2e} km" if "max_drift_km" in summary else ""
+                print(f"validation on {validation_physics} at {model.num_timesteps:,d} steps: "
+                      f"reward {summary['reward']:.1f}, time in band {summary['time_in_band']:.1%}, "
+                      f"{summary['failures']} failures{drift}")
+        training_steps_per_s = backend_throughput(env, vectorized)
+    finally:
+        env.close()
+    wall_time = time.perf_counter() - t0
+    info = {"timesteps": model.num_timesteps, "wall_time_s": wall_time,
+            "steps_per_s": model.num_timesteps / wall_time, "n_envs": n_envs, "n_steps": n_steps,
+            "training_physics": training_physics, "training_steps_per_s": training_steps_per_s,
+            "history": callback.history, "validations": validations}
+    return model, info
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-process PPO training for the station-keeping task.")
+    parser.add_argument('--timesteps', type=int, default=1000000)
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Parallel envs (worker processes, default: all cores; satellites with --vectorized).")
+    parser.add_argument('--seed', type=int, default=0, help="Env i is seeded with seed + i.")
+    parser.add_argument('--physics', default=None, choices=['poliastro', 'analytic'],
+                        help="Training backend (default: poliastro, analytic with --curriculum).")
+    parser.add_argument('--decay-model', default='constant', choices=['constant', 'drag'])
+    parser.add_argument('--ballistic-coefficient', type=float, default=50.0, help="m / (Cd A), kg/m^2.")
+    parser.add_argument('--f107', type=float, default=150.0, help="Solar flux (sfu) of the drag model.")
+    parser.add_argument('--curriculum', action='store_true',
+                        help="Train on the surrogate, validate periodically on the poliastro backend.")
+    parser.add_argument('--validate-every', type=int, default=100000)
+    parser.add_argument('--validation-episodes', type=int, default=1)
+    parser.add_argument('--validation-steps', type=int, default=None, help="Cut validation episodes after this.")
+    parser.add_argument('--vectorized', action='store_true',
+                        help="Use one in-process StationKeepingVecEnv instead of worker processes.")
+    parser.add_argument('--n-steps', type=int, default=None, help="Rollout steps per env (default: 2048 // workers).")
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--start-method', default=None, choices=['fork', 'forkserver', 'spawn'])
+    parser.add_argument('--save', default='ppo_station_keeping', help="Path of the saved model.")
+    parser.add_argument('--log', default=None,
+                        help="Stream per-rollout throughput to this results store (table 'training').")
+    args = parser.parse_args()
+
+    n_envs = args.workers or os.cpu_count()
+    physics = args.physics or ('analytic' if args.curriculum else 'poliastro')
+    env_kwargs = {"decay_model": args.decay_model, "ballistic_coefficient": args.ballistic_coefficient,
+                  "f107": args.f107}
+    kind = "vectorized satellites" if args.vectorized else f"worker envs ({physics})"
+    print(f"--- PPO training: {args.timesteps:,d} timesteps on {n_envs} {kind}, {args.decay_model} decay ---")
+    store = ColumnStore(args.log) if args.log else None
+    writer = store.tagged(physics='analytic' if args.vectorized else physics, n_envs=n_envs,
+                          vectorized=args.vectorized, seed=args.seed, decay_model=args.decay_model) if store else None
+    try:
+        model, info = train(args.timesteps, n_envs, args.seed, physics, args.vectorized, args.n_steps,
+                            args.batch_size, args.start_method, writer, env_kwargs=env_kwargs,
+                            validate_every=args.validate_every if args.curriculum else None,
+                            validation_episodes=args.validation_episodes,
+                            validation_steps=args.validation_steps)
+    finally:
+        if store is not None:
+            store.close()
+    model.save(args.save)
+    print(f"{info['timesteps']:,d} timesteps in {info['wall_time_s']:.1f} s "
+          f"({info['steps_per_s']:,.0f} steps/s, n_steps {info['n_steps']} per env; "
+          f"{info['training_physics']} physics alone: {info['training_steps_per_s'] or 0:,.0f} steps/s per env)")
+    print(f"-> Model saved to: {args.save}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# transfer_kernels.py
+# Closed-form, vectorized Delta-V / flight-time formulas for coplanar transfers
+# between circular orbits. Plain NumPy floats (km, km/s, s), no astropy Quantity,
+# so a whole GA population is evaluated in a single call.
+
+import numpy as np
+
+
+def hohmann_cost(k, r_initial, r_final):
+    """
+    Hohmann transfer between circular orbits of radius r_initial and r_final.
+    Returns (dv_total, tof) with the same conventions as Maneuver.hohmann:
+    dv in km/s, tof in s. Accepts scalars or arrays (broadcast).
+    """
+    r_i = np.asarray(r_initial, dtype=float)
+    r_f = np.asarray(r_final, dtype=float)
+    a_trans = (r_i + r_f) / 2
+    dv_a = np.sqrt(2 * k / r_i - k / a_trans) - np.sqrt(k / r_i)
+    dv_b = np.sqrt(k / r_f) - np.sqrt(2 * k / r_f - k / a_trans)
+    tof = np.pi * np.sqrt(a_trans**3 / k)
+    return np.abs(dv_a) + np.abs(dv_b), tof
+
+
+def bielliptic_impulses(k, r_initial, r_b, r_final):
+    """
+    The three impulse magnitudes (km/s) and the two half-ellipse flight times (s)
+    of a bi-elliptic transfer, same formulas as Maneuver.bielliptic.
+    """
+    r_i = np.asarray(r_initial, dtype=float)
+    r_b = np.asarray(r_b, dtype=float)
+    r_f = np.asarray(r_final, dtype=float)
+    a_trans1 = (r_i + r_b) / 2
+    a_trans2 = (r_b + r_f) / 2
+    dv_a = np.sqrt(2 * k / r_i - k / a_trans1) - np.sqrt(k / r_i)
+    dv_b = np.sqrt(2 * k / r_b - k / a_trans2) - np.sqrt(2 * k / r_b - k / a_trans1)
+    dv_c = np.sqrt(k / r_f) - np.sqrt(2 * k / r_f - k / a_trans2)
+    t_trans1 = np.pi * np.sqrt(a_trans1**3 / k)
+    t_trans2 = np.pi * np.sqrt(a_trans2**3 / k)
+    return (np.abs(dv_a), np.abs(dv_b), np.abs(dv_c)), (t_trans1, t_trans2)
+
+
+def bielliptic_cost(k, r_initial, rb_ratio, r_final):
+    """
+    Total Delta-V (km/s) and flight time (s) of the bi-elliptic transfer for an
+    array of rb_ratio = r_b / r_final genes, plus the boolean mask of valid genes.
+    Genes with rb_ratio <= 1 (or a non-finite result) are NaN instead of raising;
+    the caller decides which penalty to assign.
+    """
+    rb_ratio = np.asarray(rb_ratio, dtype=float)
+    valid = rb_ratio > 1.0
+    r_b = np.where(valid, rb_ratio, 2.0) * r_final
+    with np.errstate(invalid='ignore', divide='ignore'):
+        (dv_a, dv_b, dv_c), (t1, t2) = bielliptic_impulses(k, r_initial, r_b, r_final)
+        dv_total = dv_a + dv_b + dv_c
+        tof = t1 + t2
+    valid &= np.isfinite(dv_total)
+    return np.where(valid, dv_total, np.nan), np.where(valid, tof, np.nan), valid
+
+
+def n_impulse_speeds(k, r_initial, apsides, r_final):
+    """
+    Coplanar N-impulse transfer between circular orbits through a chain of half
+    ellipses with apsides r_initial -> apsides[..., 0] -> ... -> r_final (all burns
+    tangential, at the apsides). apsides has shape (..., N - 2): N = 2 is Hohmann,
+    N = 3 is bi-elliptic. Returns (v_before, v_after, tof): the speeds (km/s) just
+    before and after each of the N burns, shape (..., N), and the flight time (s).
+    """
+    apsides = np.asarray(apsides, dtype=float)
+    shape = apsides.shape[:-1]
+    r = np.concatenate([np.broadcast_to(float(r_initial), shape + (1,)), apsides,
+                        np.broadcast_to(float(r_final), shape + (1,))], axis=-1)
+    r_from, r_to = r[..., :-1], r[..., 1:]
+    # Speed at both ends of each half ellipse: v = sqrt(2k * other / (r * (r + other)))
+    v_depart = np.sqrt(2 * k * r_to / (r_from * (r_from + r_to)))
+    v_arrive = np.sqrt(2 * k * r_from / (r_to * (r_from + r_to)))
+    v_circ_initial = np.sqrt(k / r[..., :1])
+    v_circ_final = np.sqrt(k / r[..., -1:])
+    v_before = np.concatenate([v_circ_initial, v_arrive], axis=-1)
+    v_after = np.concatenate([v_depart, v_circ_final], axis=-1)
+    tof = np.sum(np.pi * np.sqrt(((r_from + r_to) / 2)**3 / k), axis=-1)
+    return v_before, v_after, tof
+
+
+def n_impulse_cost(k, r_initial, apsides, r_final):
+    """
+    Impulse magnitudes (km/s, shape (..., N)) and total flight time (s) of the
+    coplanar N-impulse transfer described in n_impulse_speeds.
+    """
+    v_before, v_after, tof = n_impulse_speeds(k, r_initial, apsides, r_final)
+    return np.abs(v_after - v_before), tof
+
+
+def plane_change_cost(k, r_initial, apsides, r_final, delta_i):
+    """
+    Same transfer with an inclination change split across the burns: delta_i
+    (radians, shape (..., N)) is the plane change done at each burn, so each
+    impulse is sqrt(v1^2 + v2^2 - 2 v1 v2 cos(delta_i)). Returns (impulses, tof).
+    """
+    v_before, v_after, tof = n_impulse_speeds(k, r_initial, apsides, r_final)
+    impulses = np.sqrt(np.maximum(v_before**2 + v_after**2
+                                  - 2 * v_before * v_after * np.cos(delta_i), 0.0))
+    return impulses, tof
+
+
+def batched_map(evaluate_one, evaluate_many):
+    """
+    A DEAP toolbox "map" for the kernels above: eaSimple's
+    map(toolbox.evaluate, invalid_ind), where toolbox.evaluate is `evaluate_one`
+    registered without extra arguments, becomes one evaluate_many(individuals) call
+    (a list of fitness tuples). Any other function goes to the builtin map.
+    """
+    def mapper(func, individuals):
+        if not (getattr(func, 'args', ()) or getattr(func, 'keywords', None)) \
+                and getattr(func, 'func', func) == evaluate_one:
+            return evaluate_many(list(individuals))
+        return map(func, individuals)
+    return mapper